@@ -1,16 +1,30 @@
 import pygame
 import sys
+import tempfile
+import threading
+import queue
 import math
+import os
 import random
+import json
+import struct
+import argparse
+import time
+import io
+import zlib
+import gc
+import stat
+from collections import OrderedDict, deque, namedtuple
 
-# Initialize Pygame
-pygame.init()
+import numpy as np
 
 # Game constants (reduced by 25%)
 WINDOW_WIDTH = 600  # Was 800
 WINDOW_HEIGHT = 750  # Was 1000
 TITLE = "Sunblock"
-FPS = 60
+FPS = 60  # Render rate cap
+SIM_RATE = 60  # Simulation ticks per second; all movement constants are per tick
+MAX_CATCHUP_STEPS = 5  # Most ticks simulated per rendered frame before time is dropped
 
 # Enhanced color definitions
 BLACK = (0, 0, 0)
@@ -44,6 +58,9 @@ BULLET_WIDTH = 3  # Was 4
 BULLET_HEIGHT = 9  # Was 12
 BULLET_SPEED = 11  # Was 15
 BULLET_COLOR = NEON_CYAN
+BULLET_TRAIL_LENGTH = 3  # Number of fading trail layers behind a bullet
+BULLET_TRAIL_SPACING = 4  # Pixels between trail layers
+BULLET_POOL_CAPACITY = 256  # Initial number of bullet slots, grows when full
 
 # Add these constants after the bullet constants
 INITIAL_AMMO = 500
@@ -66,6 +83,8 @@ SPRAY_ANGLE = 15  # Degrees between spray bullets
 # Add new constants for enemy behavior and ammo crates
 ENEMY_HORIZONTAL_SPEED = 2.0
 ENEMY_DIRECTION_CHANGE_TIME = 1.5  # Seconds between direction changes
+ENEMY_EXPLOSION_FRAMES = 8  # Ticks an explosion lasts, one atlas frame each
+ENEMY_SPRITE_PADDING = 12  # Room around baked enemy sprites for glow and health bar
 MAX_ENEMIES = 8  # Reduced to ensure screen doesn't get too crowded
 AMMO_CRATE_SIZE = 20
 AMMO_CRATE_SPEED = 2
@@ -80,10 +99,50 @@ LARGE_ENEMY_SCORE = 50  # Increased score reward from 30
 SCORE_PENALTY = 100
 ENEMY_TYPE_THRESHOLD = 0.7  # Reduced from 0.87 - now 70% normal enemies, 30% large enemies
 HIGHSCORE_FILE = "highscores.txt"
+HIGHSCORE_KEEP = 10  # Scores kept in the high score file
+STATS_FILE = "gamestats.jsonl"  # One JSON record per finished game
+PERSIST_QUEUE_SIZE = 64  # Pending writes before callers have to wait
+PERSIST_BATCH_SIZE = 16  # Most writes the persistence thread handles at once
+REPLAY_FILE = "last_game.sbr"  # Every game is recorded here
+REPLAY_MAGIC = b"SBRP"
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct("<4sBQIIB")  # magic, version, seed, ticks, final score, flags
+REPLAY_FLAG_HORDE = 1  # Recorded in horde mode
+# Header of every replay version still readable; version 1 had no flags
+REPLAY_HEADERS = {1: struct.Struct("<4sBQII"), REPLAY_VERSION: REPLAY_HEADER}
 MULTI_SPAWN_CHANCE = 0.3  # 30% chance to spawn multiple enemies
+HEADLESS_MAX_TICKS = SIM_RATE * 60 * 10  # Stop headless games after 10 simulated minutes
+
+# Collision broad phase constants
+SPATIAL_CELL_SIZE = max(ENEMY_WIDTH, LARGE_ENEMY_WIDTH)  # Grid cell size in pixels
+
+# Horde mode constants
+HORDE_MAX_ENEMIES = 3000  # Enemy slots in horde mode, in place of MAX_ENEMIES
+HORDE_SPAWN_RATE = 600  # Enemies spawned per second once fully ramped up
+HORDE_RAMP_TIME = 60.0  # Seconds for the spawn rate to ramp up from zero
+HORDE_LOD_MIN_ENEMIES = 200  # Smaller hordes are drawn in full detail
+HORDE_LOD_DISTANCE = 150  # Enemies further above the ship than this get LOD sprites
+HORDE_PARTICLE_CAPACITY = 1024  # Horde kills alone would keep PARTICLE_CAPACITY full
+
+# Particle constants
+PARTICLE_CAPACITY = 4096  # Particle slots; new particles overwrite the oldest when full
+PARTICLE_SIZE = 4  # Sprite diameter in pixels
+PARTICLE_FADE_STEPS = 8  # Pre-tinted alpha levels per particle color
+PARTICLE_DRAG = 0.94  # Fraction of velocity kept each tick
+PARTICLE_GRAVITY = 0.03  # Downward pull per tick
+PARTICLE_DIRTY_CELL = 16  # Particles report one dirty rect per grid cell this size they occupy
+PARTICLE_COLORS = [NEON_PINK, NEON_YELLOW, NEON_CYAN, NEON_BLUE, NEON_RED, NEON_GREEN, WHITE]
+# Per effect: count, speed, lifetime in ticks, colors, direction and spread in radians
+PARTICLE_EFFECTS = {
+    "kill": (24, 3.0, 36, (NEON_PINK, NEON_YELLOW), 0.0, math.pi),
+    "large_kill": (60, 4.0, 48, (NEON_PINK, NEON_YELLOW, WHITE), 0.0, math.pi),
+    "ship_hit": (40, 3.5, 40, (NEON_RED, WHITE), 0.0, math.pi),
+    "crate": (30, 2.5, 30, (NEON_GREEN, NEON_YELLOW), 0.0, math.pi),
+    "thruster": (2, 1.5, 14, (NEON_CYAN, NEON_BLUE), math.pi / 2, 0.3)
+}
 
 # Menu constants
-MENU_OPTIONS = ["Start Game", "Quit"]
+MENU_OPTIONS = ["Start Game", "Horde Mode", "Quit"]
 selected_option = 0
 SELECTION_ARROW = "→"  # Arrow indicator for selected item
 
@@ -99,50 +158,256 @@ BG_COLORS = [
     (40, 25, 35),    # Dark purple
     (35, 35, 45)     # Dark slate
 ]
+BACKGROUND_VARIANTS = 8  # Distinct background seeds games pick from
+BACKGROUND_DISK_CACHE = True  # Keep generated backgrounds between runs
+BACKGROUND_CACHE_DIR = ".sunblock_cache"
+BACKGROUND_VERSION = 1  # Bump whenever create_background draws differently
+
+# Rendering constants
+DIRTY_RECT_RENDERING = True  # Redraw and push only the regions that changed
+DIRTY_RECT_MAX_AREA = 0.5  # Fraction of the screen above which a full flip is cheaper
+
+# Profiler constants
+PROFILER_CAPACITY = 8192  # Phase samples kept in the profiler's ring buffer
+PROFILER_GRAPH_FRAMES = 120  # Frames shown in the overlay's frame-time graph
+PROFILER_TOGGLE_KEY = pygame.K_F3
+PROFILER_EXPORT_KEY = pygame.K_F4
+PROFILER_TRACE_FILE = "sunblock_trace.json"
+PAUSE_KEY = pygame.K_p
+
+# Text rendering cache constants
+GLOW_TEXT_CACHE_SIZE = 128  # Max number of distinct glow text stacks kept in memory
+TITLE_PULSE_FRAMES = 32  # Pre-composited frames in one cycle of the title pulse
+TITLE_PULSE_SPEED = 3  # Radians of pulse per second
+TITLE_FRAME_TIME = 2 * math.pi / TITLE_PULSE_SPEED / TITLE_PULSE_FRAMES  # Seconds per pulse frame
+
+# Menu pacing constants
+MENU_IDLE_TIMEOUT = 30.0  # Seconds without input before menus slow down
+MENU_IDLE_FPS = 4  # Redraw rate of idle menus
 
-def create_background():
+# Asset warm-up constants
+WARMUP_BUDGET = 0.008  # Seconds of warm-up work per menu frame
+WARMUP_AMMO_TEXTS = 16  # Ammo counter values pre-rendered, counting down from full
+
+def _composite_disc(pixels, center_x, center_y, transmission, color):
+    """
+    Blend a disc of color into a (width, height, 3) pixel view of a surface.
+    transmission[k] is the fraction of the old color kept at distances in
+    [k, k + 1) from the center; its last entry must be 1 (outside the disc)
+    """
+    radius = len(transmission) - 1
+    left = max(0, int(center_x) - radius)
+    right = min(pixels.shape[0], int(center_x) + radius + 1)
+    top = max(0, int(center_y) - radius)
+    bottom = min(pixels.shape[1], int(center_y) + radius + 1)
+    if left >= right or top >= bottom:
+        return
+    
+    xs = np.arange(left, right) + 0.5 - center_x
+    ys = np.arange(top, bottom) + 0.5 - center_y
+    distance = np.sqrt(xs[:, None] ** 2 + ys[None, :] ** 2)
+    keep = transmission[np.minimum(distance.astype(np.intp), radius)][..., None]
+    region = pixels[left:right, top:bottom] * keep
+    region += (1 - keep) * np.asarray(color, dtype=np.float32) + 0.5
+    pixels[left:right, top:bottom] = region
+
+def create_background(seed=None):
     """Create a static background surface with stars and planets"""
+    rng = random.Random(seed)
     background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    if pygame.display.get_surface() is not None:
+        background = background.convert()
     background.fill(BLACK)
+    pixels = pygame.surfarray.pixels3d(background)
     
-    # Draw stars
-    for _ in range(STAR_COUNT):
-        x = random.randint(0, WINDOW_WIDTH)
-        y = random.randint(0, WINDOW_HEIGHT)
-        radius = random.randint(1, 2)
-        alpha = random.randint(30, 128)
-        
-        star_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(star_surface, (*GRAY, alpha), (radius, radius), radius)
-        background.blit(star_surface, (x, y))
+    # Draw stars: all the same color on black, so overlapping stars only
+    # need their transmissions multiplied together
+    stars = np.array([(rng.randint(0, WINDOW_WIDTH), rng.randint(0, WINDOW_HEIGHT),
+                       rng.randint(1, 2), rng.randint(30, 128))
+                      for _ in range(STAR_COUNT)]).reshape(-1, 4)
+    xs, ys, keep = [], [], []
+    for radius in (1, 2):
+        # Pixels of a radius-sized disc drawn in the corner of a 2*radius square
+        dx, dy = np.mgrid[0:radius * 2, 0:radius * 2]
+        inside = (dx + 0.5 - radius) ** 2 + (dy + 0.5 - radius) ** 2 < radius ** 2
+        group = stars[stars[:, 2] == radius]
+        xs.append((group[:, 0, None] + dx[inside]).ravel())
+        ys.append((group[:, 1, None] + dy[inside]).ravel())
+        keep.append(np.repeat(1 - group[:, 3] / 255, inside.sum()))
+    xs, ys, keep = np.concatenate(xs), np.concatenate(ys), np.concatenate(keep)
+    visible = (xs < WINDOW_WIDTH) & (ys < WINDOW_HEIGHT)
+    flat, slot = np.unique(xs[visible] * WINDOW_HEIGHT + ys[visible], return_inverse=True)
+    transmission = np.ones(len(flat))
+    np.multiply.at(transmission, slot, keep[visible])
+    shade = (1 - transmission)[:, None] * np.asarray(GRAY) + 0.5
+    pixels[flat // WINDOW_HEIGHT, flat % WINDOW_HEIGHT] = shade.astype(np.uint8)
     
     # Draw planets
     for _ in range(PLANET_COUNT):
-        x = random.randint(0, WINDOW_WIDTH)
-        y = random.randint(0, WINDOW_HEIGHT)
-        radius = random.randint(20, 50)
-        color = random.choice(BG_COLORS)
-        
-        # Draw planet with gradient effect
-        for r in range(radius, 0, -1):
-            alpha = 128 if r == radius else max(30, 128 - (radius - r) * 3)
-            planet_surface = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-            pygame.draw.circle(planet_surface, (*color, alpha), (r, r), r)
-            background.blit(planet_surface, (x + radius - r, y + radius - r))
+        x = rng.randint(0, WINDOW_WIDTH)
+        y = rng.randint(0, WINDOW_HEIGHT)
+        radius = rng.randint(20, 50)
+        color = rng.choice(BG_COLORS)
+        
+        # Gradient rings fade from the rim inwards; a pixel shows every ring
+        # at least as large as its distance from the center
+        r = np.arange(1, radius + 1)
+        alpha = np.where(r == radius, 128, np.maximum(30, 128 - (radius - r) * 3))
+        transmission = np.ones(radius + 1, dtype=np.float32)
+        transmission[:-1] = np.cumprod((1 - alpha / 255)[::-1])[::-1]
+        _composite_disc(pixels, x + radius, y + radius, transmission, color)
+    
+    del pixels  # Unlock the surface
+    return background
+
+backgrounds = {}
+background_lock = threading.Lock()  # Guards backgrounds and background_builds
+background_builds = {}  # Key -> Event set once the thread building it is done
+
+def background_cache_path(seed):
+    """
+    Disk cache file for seed; the name changes with the generator version
+    and the constants it draws from, so stale images are never loaded
+    """
+    settings = repr((STAR_COUNT, PLANET_COUNT, BG_COLORS)).encode()
+    return os.path.join(BACKGROUND_CACHE_DIR,
+                        f"background-v{BACKGROUND_VERSION}-{zlib.crc32(settings):08x}"
+                        f"-{seed}-{WINDOW_WIDTH}x{WINDOW_HEIGHT}.png")
+
+def get_background(seed):
+    """
+    Return the background for seed, from memory, the disk cache, or freshly
+    generated (and then saved to disk) in that order. Safe to call from any
+    thread; a seed already being built elsewhere is waited for, not rebuilt.
+    """
+    key = (seed, WINDOW_WIDTH, WINDOW_HEIGHT)
+    with background_lock:
+        background = backgrounds.get(key)
+        if background is not None:
+            return background
+        build = background_builds.get(key)
+        building = build is None
+        if building:
+            build = background_builds[key] = threading.Event()
+    if not building:
+        build.wait()
+        # Retry, in case the other thread's build failed
+        return get_background(seed)
+    
+    try:
+        background = _build_background(seed)
+        with background_lock:
+            backgrounds[key] = background
+    finally:
+        with background_lock:
+            del background_builds[key]
+        build.set()
+    return background
+
+def _build_background(seed):
+    path = background_cache_path(seed)
+    if BACKGROUND_DISK_CACHE and os.path.exists(path):
+        try:
+            background = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                background = background.convert()
+            return background
+        except pygame.error:
+            pass  # Regenerate an unreadable cache file
     
+    background = create_background(seed)
+    if BACKGROUND_DISK_CACHE:
+        try:
+            os.makedirs(BACKGROUND_CACHE_DIR, exist_ok=True)
+            data = io.BytesIO()
+            pygame.image.save(background, data, "png")
+            os.replace(write_temp_file(path, data.getvalue()), path)
+        except (OSError, pygame.error):
+            pass  # The cache is only an optimization
     return background
 
-# Set up the game window
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption(TITLE)
+def pick_background_seed():
+    """A random background seed, preferring variants already in memory"""
+    with background_lock:
+        warm = sorted(seed for seed, width, height in backgrounds
+                      if (width, height) == (WINDOW_WIDTH, WINDOW_HEIGHT))
+    if warm:
+        return random.choice(warm)
+    return random.randrange(BACKGROUND_VARIANTS)
+
+# The game window, created by init_display() so headless runs never open one
+screen = None
+
+def init():
+    """
+    Start the pygame subsystems the game uses. Nothing is initialized at
+    import, so tools that only need the simulation never touch the display.
+    """
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+def init_display():
+    """Set up the game window"""
+    global screen
+    init()
+    if screen is None:
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption(TITLE)
+    return screen
+
+class FontRegistry:
+    """
+    Lazily loads fonts and shares them by (face, size)
+    """
+    def __init__(self):
+        self.fonts = {}
+        self.loads = 0  # Number of times a font file was actually loaded
+        self.missing = set()  # Faces already reported as unavailable
+    
+    def get(self, face, size):
+        """Return the shared font for face and size, loading it on first use"""
+        font = self.fonts.get((face, size))
+        if font is None:
+            font = self._load(face, size)
+            self.fonts[(face, size)] = font
+        return font
+    
+    def _load(self, face, size):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if face is not None:
+            # face is a font file or the name of an installed system font
+            path = face if os.path.isfile(face) else pygame.font.match_font(face)
+            try:
+                if path is None:
+                    raise FileNotFoundError(f"no font named {face!r} is installed")
+                font = pygame.font.Font(path, size)
+                self.loads += 1
+                return font
+            except (OSError, pygame.error) as e:
+                if face not in self.missing:
+                    self.missing.add(face)
+                    print(f"Using the default font in place of {face}: {e}", file=sys.stderr)
+                # Fall back to the default font, shared with its own entry
+                return self.get(None, size)
+        self.loads += 1
+        return pygame.font.Font(None, size)
+
+fonts = FontRegistry()
+
+# Fonts for text rendering, loaded on first use
+def title_font():
+    # The default font, as the title has always been drawn; naming a system
+    # face would make the first menu frame wait for the system font scan
+    return fonts.get(None, 60)  # Was 80
 
-# Initialize fonts for text rendering
-try:
-    # Try to load a more cyberpunk-style font if available
-    title_font = pygame.font.Font("arial", 60)  # Was 80
-except:
-    title_font = pygame.font.Font(None, 60)  # Was 80
-menu_font = pygame.font.Font(None, 38)  # Was 50
+def menu_font():
+    return fonts.get(None, 38)  # Was 50
+
+def hud_font():
+    return fonts.get(None, 36)
 
 def create_glowing_text(text, font, glow_color, main_color, glow_size=6, offset_3d=4):
     """
@@ -168,80 +433,184 @@ def create_glowing_text(text, font, glow_color, main_color, glow_size=6, offset_
     main_surface = font.render(text, True, main_color)
     return glow_surfaces, shadow_layers, main_surface
 
-def draw_menu_option(text, position, selected):
+def _prepare_surface(surface):
+    """Convert a surface to the display's pixel format when a display exists"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha()
+
+class GlowTextCache:
+    """
+    Bounded LRU cache of prebuilt glowing text layer stacks
+    """
+    def __init__(self, maxsize=GLOW_TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, text, font, glow_color, main_color, glow_size=6, offset_3d=4):
+        """Return (glow_surfaces, shadow_layers, main_surface), building them on a miss"""
+        key = (text, font, glow_color, main_color, glow_size, offset_3d)
+        layers = self.entries.get(key)
+        if layers is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return layers
+        
+        self.misses += 1
+        glow_surfaces, shadow_layers, main_surface = create_glowing_text(
+            text, font, glow_color, main_color, glow_size, offset_3d
+        )
+        # Every shadow layer is the same render, so share a single surface
+        shadow = [_prepare_surface(shadow_layers[0])] if shadow_layers else []
+        layers = (
+            [_prepare_surface(surface) for surface in glow_surfaces],
+            shadow * len(shadow_layers),
+            _prepare_surface(main_surface)
+        )
+        self.entries[key] = layers
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return layers
+    
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+glow_text_cache = GlowTextCache()
+
+def get_glowing_text(text, font, glow_color, main_color, glow_size=6, offset_3d=4):
     """
-    Draws a menu option with clear visual feedback for selection
+    Cached version of create_glowing_text for use in draw loops
+    """
+    return glow_text_cache.get(text, font, glow_color, main_color, glow_size, offset_3d)
+
+def composite_layers(layers):
+    """
+    Flatten (surface, rect) layers placed around (0, 0) into one surface,
+    composited over black with black keyed out. Returns the surface and the
+    rect it covers relative to (0, 0).
+    """
+    bounds = layers[0][1].unionall([rect for _, rect in layers[1:]])
+    frame = pygame.Surface(bounds.size)
+    frame.fill(BLACK)
+    for surface, rect in layers:
+        frame.blit(surface, rect.move(-bounds.x, -bounds.y))
+    if pygame.display.get_surface() is not None:
+        frame = frame.convert()
+    frame.set_colorkey(BLACK, pygame.RLEACCEL)
+    return frame, bounds
+
+def create_menu_option(text, selected):
+    """
+    Composite a menu option's glow, text and selection arrow into one
+    surface. Returns (surface, bounds, text rect), rects relative to the
+    option's centre.
     """
     # Define colors based on selection state
     text_color = NEON_GREEN if selected else NEON_YELLOW
     glow_size = 4 if selected else 2
     
     # Create the text surfaces
-    glow_surfaces, _, text_surface = create_glowing_text(
+    glow_surfaces, _, text_surface = get_glowing_text(
         text,
-        menu_font,
+        menu_font(),
         text_color,
         WHITE,
         glow_size=glow_size
     )
     
-    # Draw static glow effect
+    # Static glow effect
+    layers = []
     for surface in glow_surfaces:
         surface.set_alpha(255 if selected else 128)  # Full opacity when selected
-        rect = surface.get_rect(center=position)
-        screen.blit(surface, rect)
+        layers.append((surface, surface.get_rect(center=(0, 0))))
     
-    # Draw main text
-    text_rect = text_surface.get_rect(center=position)
-    screen.blit(text_surface, text_rect)
+    # Main text
+    text_rect = text_surface.get_rect(center=(0, 0))
+    layers.append((text_surface, text_rect))
     
-    # Draw selection arrow if selected
+    # Selection arrow if selected
     if selected:
-        arrow_surface = menu_font.render(SELECTION_ARROW, True, NEON_GREEN)
+        arrow_surface = menu_font().render(SELECTION_ARROW, True, NEON_GREEN)
         arrow_rect = arrow_surface.get_rect(
             midright=(text_rect.left - 20, text_rect.centery)
         )
-        screen.blit(arrow_surface, arrow_rect)
+        layers.append((arrow_surface, arrow_rect))
     
-    return text_rect
+    surface, bounds = composite_layers(layers)
+    return surface, bounds, text_rect
 
-def draw_menu():
+menu_options = {}
+
+def get_menu_option(text, selected):
+    """Return the cached (surface, bounds, text rect) for a menu option"""
+    key = (text, selected)
+    entry = menu_options.get(key)
+    if entry is None:
+        entry = menu_options[key] = create_menu_option(text, selected)
+    return entry
+
+def draw_menu_option(text, position, selected):
     """
-    Draws the cyberpunk-styled menu interface
+    Draws a menu option with clear visual feedback for selection and
+    returns the rect of its text, for hit testing
     """
-    current_time = pygame.time.get_ticks()
-    glow_intensity = (math.sin(current_time * 0.003) + 1) * 0.5
-    
-    # Create enhanced glowing title with pulsing effect
-    glow_surfaces, shadow_layers, main_surface = create_glowing_text(
+    surface, bounds, text_rect = get_menu_option(text, selected)
+    screen.blit(surface, bounds.move(position))
+    return text_rect.move(position)
+
+def create_title_frame(glow_intensity):
+    """Composite the menu title with its glow at the given pulse intensity"""
+    glow_surfaces, shadow_layers, main_surface = get_glowing_text(
         TITLE,
-        title_font,
+        title_font(),
         NEON_BLUE,
         NEON_PINK,
         glow_size=8,
         offset_3d=6
     )
     
-    # Calculate positions
-    title_x = WINDOW_WIDTH // 2
-    title_y = WINDOW_HEIGHT // 4
-    
-    # Draw 3D shadow layers for title
+    # 3D shadow layers
+    layers = []
     for i, shadow in enumerate(shadow_layers):
         offset = i * 2
-        rect = shadow.get_rect(center=(title_x + offset, title_y + offset))
-        screen.blit(shadow, rect)
+        layers.append((shadow, shadow.get_rect(center=(offset, offset))))
     
-    # Draw pulsing glow layers for title only
+    # Pulsing glow layers
     for i, surface in enumerate(glow_surfaces):
-        alpha = int(255 * glow_intensity * (i / len(glow_surfaces)))
-        surface.set_alpha(alpha)
-        rect = surface.get_rect(center=(title_x, title_y))
-        screen.blit(surface, rect)
+        surface.set_alpha(int(255 * glow_intensity * (i / len(glow_surfaces))))
+        layers.append((surface, surface.get_rect(center=(0, 0))))
     
-    # Draw main title
-    main_rect = main_surface.get_rect(center=(title_x, title_y))
-    screen.blit(main_surface, main_rect)
+    # Main title
+    layers.append((main_surface, main_surface.get_rect(center=(0, 0))))
+    return composite_layers(layers)
+
+title_frames = [None] * TITLE_PULSE_FRAMES
+
+def title_frame_index(current_time):
+    """Which frame of the title pulse ring shows at current_time (seconds)"""
+    phase = (current_time * TITLE_PULSE_SPEED) % (2 * math.pi)
+    return int(phase / (2 * math.pi) * TITLE_PULSE_FRAMES) % TITLE_PULSE_FRAMES
+
+def get_title_frame(index):
+    """Return the cached (surface, bounds) for one frame of the title pulse"""
+    frame = title_frames[index]
+    if frame is None:
+        glow_intensity = (math.sin(2 * math.pi * index / TITLE_PULSE_FRAMES) + 1) * 0.5
+        frame = title_frames[index] = create_title_frame(glow_intensity)
+    return frame
+
+def draw_menu(current_time=0.0):
+    """
+    Draws the cyberpunk-styled menu interface; current_time (seconds)
+    drives the title's pulse
+    """
+    # Pulsing title, pre-composited
+    surface, bounds = get_title_frame(title_frame_index(current_time))
+    screen.blit(surface, bounds.move(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
     
     # Draw menu options
     menu_rects = []
@@ -252,63 +621,610 @@ def draw_menu():
     
     return menu_rects
 
-class Bullet:
-    def __init__(self, x, y, angle=0):
-        self.x = x
-        self.y = y
-        self.width = BULLET_WIDTH
-        self.height = BULLET_HEIGHT
-        self.speed = BULLET_SPEED
-        self.angle = angle
+def create_bullet_sprite(angle=0):
+    """
+    Bakes the bullet body and its fading trail into a single surface
+    """
+    trail_height = BULLET_HEIGHT + (BULLET_TRAIL_LENGTH - 1) * BULLET_TRAIL_SPACING
+    sprite = pygame.Surface((BULLET_WIDTH, trail_height), pygame.SRCALPHA)
+    
+    # Combine the overlapping layers row by row, as if blitted on top of each other
+    for y in range(trail_height):
+        coverage = 1.0 if y < BULLET_HEIGHT else 0.0  # Main bullet body
+        for i in range(BULLET_TRAIL_LENGTH):
+            top = i * BULLET_TRAIL_SPACING
+            if top <= y < top + BULLET_HEIGHT:
+                alpha = (255 - (i * 85)) / 255
+                coverage = 1 - (1 - coverage) * (1 - alpha)
+        sprite.fill((*BULLET_COLOR, round(coverage * 255)), (0, y, BULLET_WIDTH, 1))
+    
+    if angle == 0:
+        # Same placement as drawing the body rect directly
+        return sprite, (-(BULLET_WIDTH//2), -(BULLET_HEIGHT//2))
+    
+    # Tilt the sprite along its direction of travel, keeping the body on the bullet
+    rotated = pygame.transform.rotate(sprite, -angle)
+    body_offset = (trail_height - BULLET_HEIGHT) / 2
+    rad = math.radians(angle)
+    offset = (-body_offset * math.sin(rad) - rotated.get_width() / 2,
+              body_offset * math.cos(rad) - rotated.get_height() / 2)
+    return rotated, offset
+
+bullet_sprites = {}
+
+def get_bullet_sprite(angle=0):
+    """Return the cached (sprite, offset) pair for bullets fired at angle"""
+    entry = bullet_sprites.get(angle)
+    if entry is None:
+        sprite, offset = create_bullet_sprite(angle)
+        entry = (_prepare_surface(sprite), offset)
+        bullet_sprites[angle] = entry
+    return entry
+
+def prepare_bullet_sprites():
+    """Bake one bullet sprite per spray angle ahead of time"""
+    for angle in range(-SPRAY_ANGLE, SPRAY_ANGLE + 1, SPRAY_ANGLE):
+        get_bullet_sprite(angle)
+
+def _enemy_canvas(width, height):
+    """Blank sprite with room around an enemy body, and the body's center on it"""
+    pad = ENEMY_SPRITE_PADDING
+    canvas = pygame.Surface((width + pad * 2, height + pad * 2), pygame.SRCALPHA)
+    return canvas, (pad + width//2, pad + height//2)
+
+def create_enemy_sprite(glow_radius):
+    """Bake a normal enemy with its engine glow at the given radius"""
+    sprite, (x, y) = _enemy_canvas(ENEMY_WIDTH, ENEMY_HEIGHT)
+    # Main body
+    pygame.draw.ellipse(sprite, NEON_PINK,
+                        (x - ENEMY_WIDTH//2, y - ENEMY_HEIGHT//2, ENEMY_WIDTH, ENEMY_HEIGHT))
+    # Cockpit
+    pygame.draw.ellipse(sprite, NEON_BLUE,
+                        (x - ENEMY_WIDTH//4, y - ENEMY_HEIGHT//4, ENEMY_WIDTH//2, ENEMY_HEIGHT//2))
+    # Engine glow
+    pygame.draw.circle(sprite, NEON_CYAN, (x, y + ENEMY_HEIGHT//3), glow_radius)
+    # Detail lines
+    pygame.draw.line(sprite, NEON_PINK, (x - ENEMY_WIDTH//2, y), (x + ENEMY_WIDTH//2, y), 2)
+    return sprite, (-x, -y)
+
+def create_health_overlay(health):
+    """Bake the health bar shown above a large enemy with the given health"""
+    health_width = int((LARGE_ENEMY_WIDTH * 0.8) * (health / LARGE_ENEMY_HEALTH))
+    overlay = pygame.Surface((max(health_width, 0), 5), pygame.SRCALPHA)
+    overlay.fill(NEON_GREEN)
+    return overlay, (-(health_width//2), -LARGE_ENEMY_HEIGHT//2 - 10)
+
+def create_large_enemy_sprite(health):
+    """Bake a large enemy with the health bar overlay for its health"""
+    sprite, (x, y) = _enemy_canvas(LARGE_ENEMY_WIDTH, LARGE_ENEMY_HEIGHT)
+    # Main body
+    pygame.draw.ellipse(sprite, NEON_RED,
+                        (x - LARGE_ENEMY_WIDTH//2, y - LARGE_ENEMY_HEIGHT//2,
+                         LARGE_ENEMY_WIDTH, LARGE_ENEMY_HEIGHT))
+    # Multiple cockpits
+    for i in range(3):
+        offset = (i - 1) * (LARGE_ENEMY_WIDTH//4)
+        pygame.draw.ellipse(sprite, NEON_BLUE,
+                            (x - LARGE_ENEMY_WIDTH//6 + offset, y - LARGE_ENEMY_HEIGHT//4,
+                             LARGE_ENEMY_WIDTH//3, LARGE_ENEMY_HEIGHT//2))
+    # Health bar
+    overlay, (ox, oy) = create_health_overlay(health)
+    sprite.blit(overlay, (x + ox, y + oy))
+    return sprite, (-x, -y)
+
+def create_explosion_atlas(width, color, rings, ring_spacing):
+    """
+    Bake every explosion frame side by side into one sprite sheet, returning
+    the sheet, the area of each frame and the offset of a frame's center
+    """
+    cell = width * 2 + 2
+    center = cell // 2
+    atlas = pygame.Surface((cell * ENEMY_EXPLOSION_FRAMES, cell), pygame.SRCALPHA)
+    frames = []
+    for frame in range(ENEMY_EXPLOSION_FRAMES):
+        radius = (frame / ENEMY_EXPLOSION_FRAMES) * width
+        frame_color = (color[0], max(0, color[1] - frame * 20), max(0, color[2] - frame * 20))
+        for i in range(rings):
+            pygame.draw.circle(atlas, frame_color, (frame * cell + center, center),
+                               int(radius - i * ring_spacing))
+        frames.append(pygame.Rect(frame * cell, 0, cell, cell))
+    return atlas, frames, (-center, -center)
+
+enemy_sprites = {}
+
+def get_enemy_sprite(large, state):
+    """
+    Return the cached (sprite, offset) pair for an enemy; state is the engine
+    glow radius of a normal enemy or the health of a large one
+    """
+    key = (large, state)
+    entry = enemy_sprites.get(key)
+    if entry is None:
+        factory = create_large_enemy_sprite if large else create_enemy_sprite
+        sprite, offset = factory(state)
+        entry = (_prepare_surface(sprite), offset)
+        enemy_sprites[key] = entry
+    return entry
+
+explosion_atlases = {}
+
+def get_explosion_atlas(large):
+    """Return the cached (atlas, frame areas, offset) for an enemy type's explosion"""
+    entry = explosion_atlases.get(large)
+    if entry is None:
+        if large:
+            atlas, frames, offset = create_explosion_atlas(LARGE_ENEMY_WIDTH, NEON_RED, 4, 8)
+        else:
+            atlas, frames, offset = create_explosion_atlas(ENEMY_WIDTH, NEON_PINK, 3, 5)
+        # Frames are solid circles, so a colorkeyed copy draws the same pixels
+        # several times faster than per-pixel alpha
+        atlas, _ = composite_layers([(atlas, atlas.get_rect())])
+        entry = (atlas, frames, offset)
+        explosion_atlases[large] = entry
+    return entry
+
+def create_enemy_lod_sprite(large):
+    """
+    Bake the far-away look of an enemy: body and cockpit only, opaque and
+    colorkeyed so it blits far faster than the full sprite
+    """
+    if large:
+        width, height, color = LARGE_ENEMY_WIDTH, LARGE_ENEMY_HEIGHT, NEON_RED
+    else:
+        width, height, color = ENEMY_WIDTH, ENEMY_HEIGHT, NEON_PINK
+    sprite = pygame.Surface((width, height))
+    pygame.draw.ellipse(sprite, color, sprite.get_rect())
+    pygame.draw.ellipse(sprite, NEON_BLUE, (width//4, height//4, width//2, height//2))
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+    return sprite, (-(width//2), -(height//2))
+
+enemy_lod_sprites = {}
+
+def get_enemy_lod_sprite(large):
+    """Return the cached (sprite, offset) pair for an enemy type's LOD sprite"""
+    entry = enemy_lod_sprites.get(large)
+    if entry is None:
+        entry = enemy_lod_sprites[large] = create_enemy_lod_sprite(large)
+    return entry
+
+def prepare_enemy_sprites():
+    """Bake every enemy sprite, health state and explosion atlas ahead of time"""
+    for glow_radius in range(5, 11):
+        get_enemy_sprite(False, glow_radius)
+    for health in range(1, LARGE_ENEMY_HEALTH + 1):
+        get_enemy_sprite(True, health)
+    get_explosion_atlas(False)
+    get_explosion_atlas(True)
+    get_enemy_lod_sprite(False)
+    get_enemy_lod_sprite(True)
+
+particle_sprites = {}
+
+def get_particle_sprite(color, level):
+    """Return the cached particle sprite tinted color, faded to level of PARTICLE_FADE_STEPS"""
+    key = (color, level)
+    sprite = particle_sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE), pygame.SRCALPHA)
+        alpha = 255 * level // PARTICLE_FADE_STEPS
+        radius = PARTICLE_SIZE // 2
+        # Soft halo around a brighter core
+        pygame.draw.circle(sprite, color + (alpha // 2,), (radius, radius), radius)
+        pygame.draw.circle(sprite, color + (alpha,), (radius, radius), max(1, radius // 2))
+        sprite = particle_sprites[key] = _prepare_surface(sprite)
+    return sprite
+
+class BulletPool:
+    """
+    Struct-of-arrays store for live bullets with vectorized movement
+    """
+    def __init__(self, capacity=BULLET_POOL_CAPACITY):
+        self.count = 0
+        self.high_water = 0  # Most bullets live at once
+        self.allocations = 0  # Times the columns were (re)allocated
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity):
+        self.allocations += 1
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.angle = np.zeros(capacity, dtype=np.int32)
+        # Centre of each bullet's collision rect, kept in sync with x/y
+        self.center_x = np.zeros(capacity)
+        self.center_y = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+    
+    def _columns(self):
+        return (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy,
+                self.angle, self.center_x, self.center_y, self.alive)
+    
+    def _grow(self):
+        old_columns = self._columns()
+        self._allocate(len(self.x) * 2)
+        for new, old in zip(self._columns(), old_columns):
+            new[:len(old)] = old
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn(self, x, y, angle=0):
+        """Add a bullet travelling upward, tilted by angle degrees"""
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        rad = math.radians(angle)
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.dx[i] = BULLET_SPEED * math.sin(rad)
+        self.dy[i] = -BULLET_SPEED * math.cos(rad)
+        self.angle[i] = angle
+        self.alive[i] = True
+        self.count += 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        self._update_centers(i, i + 1)
+    
+    def _update_centers(self, start, stop):
+        # Same truncation pygame.Rect applies to float coordinates
+        left = np.trunc(self.x[start:stop] - BULLET_WIDTH//2)
+        top = np.trunc(self.y[start:stop] - BULLET_HEIGHT//2)
+        self.center_x[start:stop] = left + BULLET_WIDTH//2
+        self.center_y[start:stop] = top + BULLET_HEIGHT//2
     
     def move(self):
-        """Move bullet upward"""
-        self.y -= self.speed * math.cos(math.radians(self.angle))
-        self.x += self.speed * math.sin(math.radians(self.angle))
-    
-    def draw(self, screen):
-        """Draw bullet on screen"""
-        # Enhanced bullet design
-        # Main bullet body
-        pygame.draw.rect(screen, BULLET_COLOR,
-                        (self.x - self.width//2, 
-                         self.y - self.height//2,
-                         self.width, 
-                         self.height))
-        
-        # Glowing trail
-        trail_length = 3
-        for i in range(trail_length):
-            alpha = 255 - (i * 85)
-            trail_surface = pygame.Surface((self.width, self.height))
-            trail_surface.fill(BULLET_COLOR)
-            trail_surface.set_alpha(alpha)
-            screen.blit(trail_surface,
-                       (self.x - self.width//2,
-                        self.y - self.height//2 + (i * 4)))
+        """Advance every bullet one step and drop those that left the screen"""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.dx[:n]
+        y += self.dy[:n]
+        self.alive[:n] &= ~((y < -BULLET_HEIGHT) | (x < -BULLET_WIDTH) | (x > WINDOW_WIDTH))
+        self.compact()
+        self._update_centers(0, self.count)
     
-    def is_off_screen(self):
-        """Check if bullet has moved off screen"""
-        return self.y < -self.height or self.x < -self.width or self.x > WINDOW_WIDTH
+    def find_hit(self, x, y, width, height, candidates=None):
+        """
+        Index of the first live bullet colliding with a width x height box
+        centred on (x, y), or -1 if there is none. When candidates is given
+        only those bullet indices are tested.
+        """
+        if candidates is None:
+            index = np.arange(self.count)
+        else:
+            index = np.sort(np.fromiter(candidates, dtype=np.intp, count=len(candidates)))
+        hits = (self.alive[index] &
+                (np.abs(x - self.center_x[index]) < (width + BULLET_WIDTH)//2) &
+                (np.abs(y - self.center_y[index]) < (height + BULLET_HEIGHT)//2))
+        if not hits.any():
+            return -1
+        return int(index[hits.argmax()])
+    
+    def bucket(self, grid):
+        """Refill grid with the index of every live bullet at its rect centre"""
+        grid.clear()
+        n = self.count
+        if n == 0:
+            return
+        grid.insert_points(range(n), self.center_x[:n], self.center_y[:n])
+    
+    def kill(self, index):
+        """Mark a bullet as dead; it is removed on the next compact()"""
+        self.alive[index] = False
+    
+    def compact(self):
+        """Drop dead bullets, keeping the live ones in firing order"""
+        n = self.count
+        if n == 0:
+            return
+        keep = np.flatnonzero(self.alive[:n])
+        live = len(keep)
+        if live == n:
+            return
+        for column in self._columns():
+            column[:live] = column[keep]
+        self.alive[live:n] = False
+        self.count = live
+    
+    def get_blits(self, alpha=1.0):
+        """Return (sprite, position) pairs for drawing every live bullet"""
+        n = self.count
+        xs = interpolate(self.prev_x[:n], self.x[:n], alpha)
+        ys = interpolate(self.prev_y[:n], self.y[:n], alpha)
+        blits = []
+        for angle, x, y in zip(self.angle[:n].tolist(), xs.tolist(), ys.tolist()):
+            sprite, (offset_x, offset_y) = get_bullet_sprite(angle)
+            blits.append((sprite, (x + offset_x, y + offset_y)))
+        return blits
 
-    def get_rect(self):
-        return pygame.Rect(self.x - self.width//2, self.y - self.height//2, self.width, self.height)
+class ParticleSystem:
+    """
+    Fixed-capacity struct-of-arrays particle store. Emitting claims the next
+    slots of a ring buffer, so once it is full the oldest particles are
+    overwritten rather than anything being allocated.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.head = 0  # Next slot to emit into
+        # Cosmetic randomness only; the gameplay RNG never sees particles
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)  # Ticks left; 0 is a free slot
+        self.max_life = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)  # Index into PARTICLE_COLORS
+        # Sprite for color c at fade level l is sprites[c * (PARTICLE_FADE_STEPS + 1) + l]
+        self.sprites = [get_particle_sprite(color, level) for color in PARTICLE_COLORS
+                        for level in range(PARTICLE_FADE_STEPS + 1)]
+    
+    def __len__(self):
+        return int(np.count_nonzero(self.life))
+    
+    def emit(self, x, y, effect):
+        """
+        Spawn the particles of one PARTICLE_EFFECTS entry at (x, y). x and y
+        may also be arrays, to emit the effect at many origins in one go.
+        """
+        count, speed, life, colors, direction, spread = PARTICLE_EFFECTS[effect]
+        origins = np.size(x)
+        total = count * origins
+        rng = self.rng
+        index = (self.head + np.arange(total)) % self.capacity
+        self.head = (self.head + total) % self.capacity
+        angle = direction + rng.uniform(-spread, spread, total)
+        velocity = speed * rng.uniform(0.3, 1.0, total)
+        if origins > 1:
+            x = np.repeat(x, count)
+            y = np.repeat(y, count)
+        self.x[index] = self.prev_x[index] = x
+        self.y[index] = self.prev_y[index] = y
+        self.vx[index] = np.cos(angle) * velocity
+        self.vy[index] = np.sin(angle) * velocity
+        lives = rng.integers(life // 2, life + 1, total)
+        self.life[index] = lives
+        self.max_life[index] = lives
+        palette = np.array([PARTICLE_COLORS.index(color) for color in colors])
+        self.color[index] = palette[rng.integers(len(palette), size=total)]
+    
+    def update(self):
+        """Advance every particle one tick"""
+        # Whole-array updates cost the same however many particles are live
+        live = self.life > 0
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= PARTICLE_DRAG
+        self.vy *= PARTICLE_DRAG
+        self.vy += PARTICLE_GRAVITY
+        self.life -= live
+    
+    def draw(self, screen, alpha=1.0):
+        """
+        Blit every live particle in one batch and return the rects they
+        cover, one per occupied PARTICLE_DIRTY_CELL grid cell
+        """
+        index = np.flatnonzero(self.life)
+        if len(index) == 0:
+            return []
+        xs = interpolate(self.prev_x[index], self.x[index], alpha) - PARTICLE_SIZE / 2
+        ys = interpolate(self.prev_y[index], self.y[index], alpha) - PARTICLE_SIZE / 2
+        # Fade level rounds up so a particle stays visible until its last tick
+        max_life = self.max_life[index]
+        levels = (self.life[index] * PARTICLE_FADE_STEPS + max_life - 1) // max_life
+        sprite_index = self.color[index] * (PARTICLE_FADE_STEPS + 1) + levels
+        sprites = self.sprites
+        screen.blits([(sprites[i], (x, y)) for i, x, y in
+                      zip(sprite_index.tolist(), xs.tolist(), ys.tolist())], doreturn=False)
+        
+        # Separate bursts stay separate rects instead of one box spanning them all
+        cell = PARTICLE_DIRTY_CELL
+        columns = np.floor_divide(xs, cell).astype(np.int64)
+        rows = np.floor_divide(ys, cell).astype(np.int64)
+        first_column = int(columns.min())
+        span = int(columns.max()) - first_column + 1
+        cells = np.unique(rows * span + (columns - first_column)).tolist()
+        size = cell + PARTICLE_SIZE + 2
+        return [pygame.Rect((key % span + first_column) * cell - 1, (key // span) * cell - 1,
+                            size, size) for key in cells]
+
+class SpatialHash:
+    """
+    Uniform grid that buckets items by the cells their bounding box covers
+    """
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def clear(self):
+        self.cells.clear()
+    
+    def _cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (range(int(left // size), int(right // size) + 1),
+                range(int(top // size), int(bottom // size) + 1))
+    
+    def insert(self, item, left, top, right, bottom):
+        """Add item to every cell overlapped by the box"""
+        columns, rows = self._cell_range(left, top, right, bottom)
+        for cx in columns:
+            for cy in rows:
+                self.cells.setdefault((cx, cy), []).append(item)
+    
+    def insert_points(self, items, xs, ys):
+        """Add each item to the single cell containing its point"""
+        columns = np.floor_divide(xs, self.cell_size).astype(int).tolist()
+        rows = np.floor_divide(ys, self.cell_size).astype(int).tolist()
+        for item, cx, cy in zip(items, columns, rows):
+            self.cells.setdefault((cx, cy), []).append(item)
+    
+    def query(self, left, top, right, bottom):
+        """Return the set of items sharing a cell with the box"""
+        found = set()
+        columns, rows = self._cell_range(left, top, right, bottom)
+        for cx in columns:
+            for cy in rows:
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+    
+    def query_rect(self, rect):
+        return self.query(rect.left, rect.top, rect.right, rect.bottom)
+
+def interpolate(previous, current, alpha):
+    """Blend between the last two tick positions for rendering"""
+    return previous + (current - previous) * alpha
+
+# Per-tick player input, sampled from the keyboard or supplied by a script
+InputFrame = namedtuple("InputFrame", ["left", "right", "space", "escape"])
+NO_INPUT = InputFrame(False, False, False, False)
+
+def keyboard_input(game):
+    """Sample the keyboard into an InputFrame"""
+    keys = pygame.key.get_pressed()
+    return InputFrame(bool(keys[pygame.K_LEFT]), bool(keys[pygame.K_RIGHT]),
+                      bool(keys[pygame.K_SPACE]), bool(keys[pygame.K_ESCAPE]))
+
+class ScriptedInput:
+    """
+    Input source that plays back a fixed list of InputFrames, one per tick
+    """
+    def __init__(self, frames, loop=False):
+        self.frames = list(frames)
+        self.loop = loop
+    
+    def __call__(self, game):
+        if self.loop and self.frames:
+            return self.frames[game.tick % len(self.frames)]
+        if game.tick < len(self.frames):
+            return self.frames[game.tick]
+        return NO_INPUT
+
+class InputRecorder:
+    """
+    Input source that passes another source through and keeps every frame
+    """
+    def __init__(self, source=keyboard_input):
+        self.source = source
+        self.frames = []
+    
+    def __call__(self, game):
+        frame = self.source(game)
+        self.frames.append(frame)
+        return frame
+
+def encode_inputs(frames):
+    """
+    Pack InputFrames into runs of identical key states, each run one varint
+    holding (run length << 4) | key bits
+    """
+    data = bytearray()
+    index = 0
+    while index < len(frames):
+        frame = frames[index]
+        run = 1
+        while index + run < len(frames) and frames[index + run] == frame:
+            run += 1
+        index += run
+        mask = sum(1 << bit for bit, pressed in enumerate(frame) if pressed)
+        value = (run << 4) | mask
+        while value >= 0x80:
+            data.append((value & 0x7f) | 0x80)
+            value >>= 7
+        data.append(value)
+    return bytes(data)
+
+def decode_inputs(data):
+    """Unpack the output of encode_inputs back into InputFrames"""
+    frames = []
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if byte & 0x80:
+            continue
+        frame = InputFrame(*(bool(value & (1 << bit)) for bit in range(4)))
+        frames.extend([frame] * (value >> 4))
+        value = 0
+        shift = 0
+    if shift:
+        raise ValueError("replay input log is truncated")
+    return frames
+
+Replay = namedtuple("Replay", ["seed", "frames", "score", "horde"], defaults=(False,))
+
+def encode_replay(replay):
+    flags = REPLAY_FLAG_HORDE if replay.horde else 0
+    header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, replay.seed,
+                                len(replay.frames), replay.score, flags)
+    return header + encode_inputs(replay.frames)
+
+def load_replay(path):
+    """Read a replay file written by encode_replay"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < len(REPLAY_MAGIC) + 1 or not data.startswith(REPLAY_MAGIC):
+        raise ValueError(f"{path} is not a replay file")
+    version = data[len(REPLAY_MAGIC)]
+    header = REPLAY_HEADERS.get(version)
+    if header is None:
+        raise ValueError(f"{path} is replay version {version}, expected at most {REPLAY_VERSION}")
+    if len(data) < header.size:
+        raise ValueError(f"{path} is not a replay file")
+    magic, version, seed, ticks, score, *flags = header.unpack_from(data)
+    frames = decode_inputs(data[header.size:])
+    if len(frames) != ticks:
+        raise ValueError(f"{path} holds {len(frames)} ticks of input, expected {ticks}")
+    horde = bool(flags and flags[0] & REPLAY_FLAG_HORDE)
+    return Replay(seed, frames, score, horde)
 
 class Enemy:
-    def __init__(self):
-        self.x = random.randint(ENEMY_WIDTH, WINDOW_WIDTH - ENEMY_WIDTH)
+    __slots__ = ("x", "y", "prev_x", "prev_y", "width", "height", "speed", "exploding",
+                 "explosion_frame", "explosion_max_frames", "direction",
+                 "direction_change_time", "last_direction_change", "rng", "alive")
+    
+    def __init__(self, rng=random):
+        self.reset(rng)
+    
+    def reset(self, rng=random):
+        """(Re)initialize this enemy, so pooled instances can be reused"""
+        self.x = rng.randint(ENEMY_WIDTH, WINDOW_WIDTH - ENEMY_WIDTH)
         self.y = -ENEMY_HEIGHT
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.width = ENEMY_WIDTH
         self.height = ENEMY_HEIGHT
         self.speed = ENEMY_SPEED
         self.exploding = False
         self.explosion_frame = 0
-        self.explosion_max_frames = 8
-        self.direction = random.choice([-1, 1])
-        self.direction_change_time = random.uniform(0, ENEMY_DIRECTION_CHANGE_TIME)
+        self.explosion_max_frames = ENEMY_EXPLOSION_FRAMES
+        self.alive = True
+        self.direction = rng.choice([-1, 1])
+        self.direction_change_time = rng.uniform(0, ENEMY_DIRECTION_CHANGE_TIME)
         self.last_direction_change = 0
+        self.rng = rng
     
-    def move(self):
+    def move(self, current_time):
+        if self.exploding:
+            self.explosion_frame += 1
+        
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.y += self.speed
         self.x += ENEMY_HORIZONTAL_SPEED * self.direction
         
@@ -321,46 +1237,29 @@ class Enemy:
             self.direction = -1
         
         # Random direction changes
-        current_time = pygame.time.get_ticks() / 1000.0
         if current_time - self.last_direction_change > self.direction_change_time:
-            self.direction *= -1 if random.random() < 0.7 else 1
+            self.direction *= -1 if self.rng.random() < 0.7 else 1
             self.last_direction_change = current_time
-            self.direction_change_time = random.uniform(0.5, ENEMY_DIRECTION_CHANGE_TIME)
+            self.direction_change_time = self.rng.uniform(0.5, ENEMY_DIRECTION_CHANGE_TIME)
     
-    def draw(self, screen):
+    def get_sprite(self, current_time=0.0):
+        """Return the (sprite, offset) for this enemy while it is alive"""
+        glow_radius = abs(math.sin(current_time * 10)) * 5 + 5
+        return get_enemy_sprite(False, int(glow_radius))
+    
+    def get_blit(self, alpha=1.0, current_time=0.0):
+        """
+        Return the (sprite, position, area) entry that draws this enemy;
+        current_time (seconds) animates the engine glow
+        """
+        x = int(interpolate(self.prev_x, self.x, alpha))
+        y = int(interpolate(self.prev_y, self.y, alpha))
         if self.exploding:
-            # Enhanced explosion animation
-            radius = (self.explosion_frame / self.explosion_max_frames) * ENEMY_WIDTH
-            for i in range(3):  # Multiple circles for better effect
-                color = (NEON_PINK[0], 
-                        max(0, NEON_PINK[1] - self.explosion_frame * 20),
-                        max(0, NEON_PINK[2] - self.explosion_frame * 20))
-                pygame.draw.circle(screen, color, 
-                                 (int(self.x), int(self.y)), 
-                                 int(radius - i * 5))
-            self.explosion_frame += 1
-        else:
-            # Enhanced enemy ship design
-            # Main body
-            pygame.draw.ellipse(screen, NEON_PINK, 
-                              (self.x - ENEMY_WIDTH//2, self.y - ENEMY_HEIGHT//2,
-                               ENEMY_WIDTH, ENEMY_HEIGHT))
-            
-            # Cockpit
-            pygame.draw.ellipse(screen, NEON_BLUE,
-                              (self.x - ENEMY_WIDTH//4, self.y - ENEMY_HEIGHT//4,
-                               ENEMY_WIDTH//2, ENEMY_HEIGHT//2))
-            
-            # Engine glow
-            glow_radius = abs(math.sin(pygame.time.get_ticks() * 0.01)) * 5 + 5
-            pygame.draw.circle(screen, NEON_CYAN,
-                             (int(self.x), int(self.y + ENEMY_HEIGHT//3)),
-                             int(glow_radius))
-            
-            # Detail lines
-            pygame.draw.line(screen, NEON_PINK,
-                           (self.x - ENEMY_WIDTH//2, self.y),
-                           (self.x + ENEMY_WIDTH//2, self.y), 2)
+            atlas, frames, (ox, oy) = get_explosion_atlas(isinstance(self, LargeEnemy))
+            frame = frames[min(self.explosion_frame, len(frames) - 1)]
+            return atlas, (x + ox, y + oy), frame
+        sprite, (ox, oy) = self.get_sprite(current_time)
+        return sprite, (x + ox, y + oy), None
     
     def collides_with(self, rect):
         return (abs(self.x - rect.centerx) < (ENEMY_WIDTH + rect.width)//2 and
@@ -370,84 +1269,71 @@ class Enemy:
         return self.exploding and self.explosion_frame >= self.explosion_max_frames
 
 class LargeEnemy(Enemy):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ("health",)
+    
+    def reset(self, rng=random):
+        super().reset(rng)
         self.width = LARGE_ENEMY_WIDTH
         self.height = LARGE_ENEMY_HEIGHT
         self.speed = LARGE_ENEMY_SPEED
         self.health = LARGE_ENEMY_HEALTH
-        self.x = random.randint(LARGE_ENEMY_WIDTH, WINDOW_WIDTH - LARGE_ENEMY_WIDTH)
+        self.x = rng.randint(LARGE_ENEMY_WIDTH, WINDOW_WIDTH - LARGE_ENEMY_WIDTH)
+        self.prev_x = self.x
     
-    def draw(self, screen):
-        if self.exploding:
-            # Enhanced explosion animation for large enemy
-            radius = (self.explosion_frame / self.explosion_max_frames) * LARGE_ENEMY_WIDTH
-            for i in range(4):  # More circles for bigger explosion
-                color = (NEON_RED[0], 
-                        max(0, NEON_RED[1] - self.explosion_frame * 20),
-                        max(0, NEON_RED[2] - self.explosion_frame * 20))
-                pygame.draw.circle(screen, color, 
-                                 (int(self.x), int(self.y)), 
-                                 int(radius - i * 8))
-            self.explosion_frame += 1
-        else:
-            # Enhanced large enemy design
-            # Main body
-            pygame.draw.ellipse(screen, NEON_RED, 
-                              (self.x - self.width//2, self.y - self.height//2,
-                               self.width, self.height))
-            
-            # Multiple cockpits
-            for i in range(3):
-                offset = (i - 1) * (self.width//4)
-                pygame.draw.ellipse(screen, NEON_BLUE,
-                                  (self.x - self.width//6 + offset, 
-                                   self.y - self.height//4,
-                                   self.width//3, self.height//2))
-            
-            # Health bar
-            health_width = (self.width * 0.8) * (self.health / LARGE_ENEMY_HEALTH)
-            pygame.draw.rect(screen, NEON_GREEN,
-                           (self.x - health_width//2, 
-                            self.y - self.height//2 - 10,
-                            health_width, 5))
+    def get_sprite(self, current_time=0.0):
+        return get_enemy_sprite(True, max(1, self.health))
 
 class AmmoCrate:
-    def __init__(self):
+    __slots__ = ("width", "height", "x", "y", "prev_x", "prev_y", "speed", "rotation",
+                 "rotation_speed", "alive")
+    
+    def __init__(self, rng=random):
+        self.reset(rng)
+    
+    def reset(self, rng=random):
+        """(Re)initialize this crate, so pooled instances can be reused"""
         self.width = AMMO_CRATE_SIZE
         self.height = AMMO_CRATE_SIZE
-        self.x = random.randint(self.width, WINDOW_WIDTH - self.width)
+        self.x = rng.randint(self.width, WINDOW_WIDTH - self.width)
         self.y = -self.height
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.speed = AMMO_CRATE_SPEED
         self.rotation = 0
         self.rotation_speed = 2
+        self.alive = True
     
     def move(self):
+        self.prev_y = self.y
         self.y += self.speed
         self.rotation = (self.rotation + self.rotation_speed) % 360
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        x = interpolate(self.prev_x, self.x, alpha)
+        y = interpolate(self.prev_y, self.y, alpha)
+        drawn = []
         # Draw base crate
         crate_rect = pygame.Rect(
-            self.x - self.width//2,
-            self.y - self.height//2,
+            x - self.width//2,
+            y - self.height//2,
             self.width,
             self.height
         )
-        pygame.draw.rect(screen, NEON_YELLOW, crate_rect, 2)
+        drawn.append(pygame.draw.rect(screen, NEON_YELLOW, crate_rect, 2))
         
         # Draw diagonal cross
-        pygame.draw.line(screen, NEON_YELLOW,
-                        (self.x - self.width//2, self.y - self.height//2),
-                        (self.x + self.width//2, self.y + self.height//2), 2)
-        pygame.draw.line(screen, NEON_YELLOW,
-                        (self.x - self.width//2, self.y + self.height//2),
-                        (self.x + self.width//2, self.y - self.height//2), 2)
+        drawn.append(pygame.draw.line(screen, NEON_YELLOW,
+                                     (x - self.width//2, y - self.height//2),
+                                     (x + self.width//2, y + self.height//2), 2))
+        drawn.append(pygame.draw.line(screen, NEON_YELLOW,
+                                     (x - self.width//2, y + self.height//2),
+                                     (x + self.width//2, y - self.height//2), 2))
         
         # Draw ammo symbol
-        pygame.draw.rect(screen, NEON_CYAN,
-                        (self.x - 4, self.y - 6, 8, 12))
-        
+        drawn.append(pygame.draw.rect(screen, NEON_CYAN,
+                                     (x - 4, y - 6, 8, 12)))
+        return drawn[0].unionall(drawn[1:])
+    
     def is_off_screen(self):
         return self.y > WINDOW_HEIGHT
     
@@ -455,13 +1341,465 @@ class AmmoCrate:
         return pygame.Rect(self.x - self.width//2, self.y - self.height//2,
                          self.width, self.height)
 
+class EntityPool:
+    """
+    Free list of retired entities of one class, handed back out by acquire()
+    instead of building new instances
+    """
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.live = 0  # Instances handed out and not yet released
+        self.high_water = 0  # Most instances live at once
+        self.allocations = 0  # Instances actually constructed
+    
+    def acquire(self, *args):
+        """Return a recycled (or, if none are free, new) instance reset with args"""
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+        else:
+            entity = self.cls(*args)
+            self.allocations += 1
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return entity
+    
+    def release(self, entity):
+        """Return an entity that is no longer in play to the free list"""
+        self.live -= 1
+        self.free.append(entity)
+
+class EntityPools(dict):
+    """Entity pools keyed by class, for lists that hold several classes"""
+    def release(self, entity):
+        self[type(entity)].release(entity)
+
+class EntityList:
+    """
+    Ordered collection of live entities. Entities are killed in place while
+    iterating and dropped in a single pass by compact(), once per tick.
+    Killing is idempotent, so an entity can never be removed twice.
+    """
+    def __init__(self, release=None):
+        self.items = []
+        self.live = 0
+        self.release = release  # Called with each entity compact() drops
+    
+    def __len__(self):
+        return self.live
+    
+    def __iter__(self):
+        # Entities killed since the last compact() are skipped
+        return (entity for entity in self.items if entity.alive)
+    
+    def append(self, entity):
+        entity.alive = True
+        self.items.append(entity)
+        self.live += 1
+    
+    def kill(self, entity):
+        """Mark an entity dead; returns False if it already was"""
+        if not entity.alive:
+            return False
+        entity.alive = False
+        self.live -= 1
+        return True
+    
+    def compact(self):
+        """Drop every dead entity, keeping the order of the rest"""
+        if self.live == len(self.items):
+            return
+        survivors = []
+        for entity in self.items:
+            if entity.alive:
+                survivors.append(entity)
+            elif self.release is not None:
+                self.release(entity)
+        self.items = survivors
+
+class EnemySwarm:
+    """
+    Struct-of-arrays enemy store for horde mode. Positions, directions,
+    direction-change timers, health and explosion state of both enemy types
+    live in NumPy columns, so moving, colliding and drawing thousands of
+    enemies costs a handful of whole-array operations per tick.
+    """
+    def __init__(self, seed=None, capacity=HORDE_MAX_ENEMIES):
+        self.capacity = capacity
+        self.count = 0
+        self.spawn_debt = 0.0  # Fractional enemies owed by the spawn rate
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.direction = np.zeros(capacity)  # -1 or 1
+        self.direction_change_time = np.zeros(capacity)
+        self.last_direction_change = np.zeros(capacity)
+        self.large = np.zeros(capacity, dtype=bool)
+        self.health = np.zeros(capacity, dtype=np.int32)
+        self.exploding = np.zeros(capacity, dtype=bool)
+        self.explosion_frame = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+    
+    def _columns(self):
+        return (self.x, self.y, self.prev_x, self.prev_y, self.speed, self.direction,
+                self.direction_change_time, self.last_direction_change, self.large,
+                self.health, self.exploding, self.explosion_frame, self.alive)
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn(self, count, current_time):
+        """Add up to count enemies above the screen, as many as there are free slots"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        i, j = self.count, self.count + count
+        rng = self.rng
+        large = rng.random(count) >= ENEMY_TYPE_THRESHOLD
+        margin = np.where(large, LARGE_ENEMY_WIDTH, ENEMY_WIDTH)
+        self.x[i:j] = self.prev_x[i:j] = rng.integers(margin, WINDOW_WIDTH - margin, endpoint=True)
+        self.y[i:j] = self.prev_y[i:j] = -ENEMY_HEIGHT
+        self.speed[i:j] = np.where(large, LARGE_ENEMY_SPEED, ENEMY_SPEED)
+        self.direction[i:j] = rng.choice((-1.0, 1.0), count)
+        self.direction_change_time[i:j] = rng.uniform(0, ENEMY_DIRECTION_CHANGE_TIME, count)
+        self.last_direction_change[i:j] = current_time
+        self.large[i:j] = large
+        self.health[i:j] = np.where(large, LARGE_ENEMY_HEALTH, 1)
+        self.exploding[i:j] = False
+        self.explosion_frame[i:j] = 0
+        self.alive[i:j] = True
+        self.count = j
+    
+    def move(self, current_time):
+        """Advance every enemy one tick, as Enemy.move does for one"""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        direction = self.direction[:n]
+        self.explosion_frame[:n] += self.exploding[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        y += self.speed[:n]
+        x += ENEMY_HORIZONTAL_SPEED * direction
+        
+        # Keep within screen bounds, turning back at the edges
+        direction[x < ENEMY_WIDTH//2] = 1
+        direction[x > WINDOW_WIDTH - ENEMY_WIDTH//2] = -1
+        np.clip(x, ENEMY_WIDTH//2, WINDOW_WIDTH - ENEMY_WIDTH//2, out=x)
+        
+        # Random direction changes
+        due = np.flatnonzero(current_time - self.last_direction_change[:n] >
+                             self.direction_change_time[:n])
+        if len(due):
+            flip = self.rng.random(len(due)) < 0.7
+            direction[due] = np.where(flip, -direction[due], direction[due])
+            self.last_direction_change[due] = current_time
+            self.direction_change_time[due] = self.rng.uniform(
+                0.5, ENEMY_DIRECTION_CHANGE_TIME, len(due))
+    
+    def hit_by(self, bullets):
+        """
+        Match live bullets to the enemies they hit, at most one enemy per
+        bullet and one bullet per enemy, and kill those bullets. Returns the
+        indices of the enemies that were hit.
+        """
+        n, b = self.count, bullets.count
+        if n == 0 or b == 0:
+            return np.empty(0, dtype=np.intp)
+        reach_x = (ENEMY_WIDTH + BULLET_WIDTH)//2
+        reach_y = (ENEMY_HEIGHT + BULLET_HEIGHT)//2
+        
+        # Sweep along x: each bullet's candidates are a window of the x-sorted enemies
+        order = np.argsort(self.x[:n], kind="stable")
+        sorted_x = self.x[:n][order]
+        bullet_x = bullets.center_x[:b]
+        start = np.searchsorted(sorted_x, bullet_x - reach_x, side="right")
+        stop = np.searchsorted(sorted_x, bullet_x + reach_x, side="left")
+        counts = np.maximum(stop - start, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp)
+        
+        # Expand the windows into (bullet, enemy) pairs and test them all at once
+        pair_bullet = np.repeat(np.arange(b), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_enemy = order[np.repeat(start, counts) + offsets]
+        hits = (np.abs(self.y[pair_enemy] - bullets.center_y[pair_bullet]) < reach_y)
+        hits &= self.alive[pair_enemy] & ~self.exploding[pair_enemy]
+        hits &= bullets.alive[pair_bullet]
+        pair_bullet = pair_bullet[hits]
+        pair_enemy = pair_enemy[hits]
+        
+        _, first = np.unique(pair_bullet, return_index=True)
+        pair_bullet = pair_bullet[first]
+        pair_enemy = pair_enemy[first]
+        enemies, first = np.unique(pair_enemy, return_index=True)
+        bullets.alive[pair_bullet[first]] = False
+        return enemies
+    
+    def touching(self, rect):
+        """Indices of the live, unexploded enemies that collide with rect"""
+        n = self.count
+        return np.flatnonzero(
+            self.alive[:n] & ~self.exploding[:n] &
+            (np.abs(self.x[:n] - rect.centerx) < (ENEMY_WIDTH + rect.width)//2) &
+            (np.abs(self.y[:n] - rect.centery) < (ENEMY_HEIGHT + rect.height)//2))
+    
+    def compact(self):
+        """Drop dead enemies and finished explosions, keeping spawn order"""
+        n = self.count
+        if n == 0:
+            return
+        finished = self.exploding[:n] & (self.explosion_frame[:n] >= ENEMY_EXPLOSION_FRAMES)
+        keep = np.flatnonzero(self.alive[:n] & ~finished)
+        live = len(keep)
+        if live == n:
+            return
+        for column in self._columns():
+            column[:live] = column[keep]
+        self.alive[live:n] = False
+        self.count = live
+    
+    def _sprite_table(self, current_time):
+        """
+        Every (surface, offset, area) an enemy can be drawn with this frame:
+        the normal sprite, the large one per health, both LOD sprites, then
+        each explosion frame of both types
+        """
+        glow_radius = abs(math.sin(current_time * 10)) * 5 + 5
+        table = [get_enemy_sprite(False, int(glow_radius)) + (None,)]
+        for health in range(1, LARGE_ENEMY_HEALTH + 1):
+            table.append(get_enemy_sprite(True, health) + (None,))
+        table.append(get_enemy_lod_sprite(False) + (None,))
+        table.append(get_enemy_lod_sprite(True) + (None,))
+        for large in (False, True):
+            atlas, frames, offset = get_explosion_atlas(large)
+            table.extend((atlas, offset, frame) for frame in frames)
+        return table
+    
+    def draw(self, screen, alpha=1.0, current_time=0.0, ship_y=WINDOW_HEIGHT):
+        """
+        Blit every enemy in one batch and return their bounds, or None. In a
+        big horde, enemies far above ship_y are drawn with LOD sprites.
+        """
+        n = self.count
+        if n == 0:
+            return None
+        xs = interpolate(self.prev_x[:n], self.x[:n], alpha).astype(np.int32)
+        ys = interpolate(self.prev_y[:n], self.y[:n], alpha).astype(np.int32)
+        large = self.large[:n]
+        
+        # Pick each enemy's entry in the sprite table
+        lod_base = 1 + LARGE_ENEMY_HEALTH
+        explosion_base = lod_base + 2
+        kind = np.where(large, np.maximum(self.health[:n], 1), 0)
+        if n >= HORDE_LOD_MIN_ENEMIES:
+            far = ys < ship_y - HORDE_LOD_DISTANCE
+            kind = np.where(far, lod_base + large, kind)
+        exploding = self.exploding[:n]
+        if exploding.any():
+            frame = np.minimum(self.explosion_frame[:n], ENEMY_EXPLOSION_FRAMES - 1)
+            kind = np.where(exploding, explosion_base + large * ENEMY_EXPLOSION_FRAMES + frame,
+                            kind)
+        
+        table = self._sprite_table(current_time)
+        offset_x = np.array([entry[1][0] for entry in table])
+        offset_y = np.array([entry[1][1] for entry in table])
+        widths = np.array([(entry[2] or entry[0].get_rect()).width for entry in table])
+        heights = np.array([(entry[2] or entry[0].get_rect()).height for entry in table])
+        left = xs + offset_x[kind]
+        top = ys + offset_y[kind]
+        screen.blits([(table[k][0], (x, y), table[k][2]) for k, x, y in
+                      zip(kind.tolist(), left.tolist(), top.tolist())], doreturn=False)
+        
+        bounds_left = int(left.min())
+        bounds_top = int(top.min())
+        return pygame.Rect(bounds_left, bounds_top,
+                           int((left + widths[kind]).max()) - bounds_left,
+                           int((top + heights[kind]).max()) - bounds_top)
+
+class FrameProfiler:
+    """
+    Per-phase frame timer recording into a fixed-size ring buffer.
+    
+    Sections are opened with begin(), split into consecutive phases with
+    mark() and closed with end(). Every call returns straight away while
+    the profiler is disabled.
+    """
+    def __init__(self, capacity=PROFILER_CAPACITY, enabled=False):
+        self.enabled = enabled
+        self.overlay = enabled
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = [0] * capacity
+        self.durations = [0] * capacity
+        self.count = 0  # Total samples ever recorded; the ring holds the last capacity
+        self.stack = []  # Open sections as [name, start, phase name, phase start]
+        self.frame_times = deque(maxlen=PROFILER_GRAPH_FRAMES)
+        self.latest = {}  # Most recent duration of each phase, in nanoseconds
+    
+    def toggle(self):
+        self.enabled = self.overlay = not self.enabled
+        self.stack.clear()
+    
+    def _record(self, name, start, end):
+        slot = self.count % self.capacity
+        self.names[slot] = name
+        self.starts[slot] = start
+        self.durations[slot] = end - start
+        self.latest[name] = end - start
+        self.count += 1
+    
+    def begin(self, name):
+        """Open a section; phases marked inside it nest under it"""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.stack.append([name, now, None, now])
+    
+    def mark(self, name):
+        """End the current phase of the open section and start the next one"""
+        if not self.enabled or not self.stack:
+            return
+        now = time.perf_counter_ns()
+        section = self.stack[-1]
+        if section[2] is not None:
+            self._record(section[2], section[3], now)
+        section[2] = name
+        section[3] = now
+    
+    def end(self):
+        """Close the innermost section along with its last phase"""
+        if not self.enabled or not self.stack:
+            return
+        now = time.perf_counter_ns()
+        name, start, phase, phase_start = self.stack.pop()
+        if phase is not None:
+            self._record(phase, phase_start, now)
+        self._record(name, start, now)
+        if not self.stack:
+            self.frame_times.append((now - start) / 1e6)
+    
+    def samples(self):
+        """Recorded (name, start_ns, duration_ns) samples, oldest first"""
+        first = max(0, self.count - self.capacity)
+        for i in range(first, self.count):
+            slot = i % self.capacity
+            yield self.names[slot], self.starts[slot], self.durations[slot]
+    
+    def export_chrome_trace(self, path=PROFILER_TRACE_FILE):
+        """Write the ring buffer as Chrome trace-event JSON (chrome://tracing)"""
+        events = [{"name": name, "cat": "sunblock", "ph": "X",
+                   "ts": start / 1000.0, "dur": duration / 1000.0,
+                   "pid": 1, "tid": 1}
+                  for name, start, duration in self.samples()]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+    
+    def draw_overlay(self, screen):
+        """Draw a rolling frame-time graph and the latest phase timings, returning its bounds"""
+        width, height = PROFILER_GRAPH_FRAMES * 2, 80
+        left, top = 10, WINDOW_HEIGHT - height - 60
+        budget = 1000.0 / FPS
+        
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, frame_time in enumerate(self.frame_times):
+            bar = min(height, int(frame_time / (budget * 2) * height))
+            color = NEON_GREEN if frame_time <= budget else NEON_RED
+            pygame.draw.line(panel, color, (i * 2, height - 1), (i * 2, height - bar))
+        # Line marking one frame's worth of time
+        pygame.draw.line(panel, NEON_YELLOW, (0, height // 2), (width, height // 2))
+        drawn = [screen.blit(panel, (left, top))]
+        
+        font = fonts.get(None, 20)
+        lines = [f"frame {self.frame_times[-1]:.2f} ms" if self.frame_times else "frame -"]
+        for name in ("update", "draw", "flip"):
+            if name in self.latest:
+                lines.append(f"{name} {self.latest[name] / 1e6:.2f} ms")
+        for i, line in enumerate(lines):
+            text = font.render(line, True, WHITE)
+            drawn.append(screen.blit(text, (left + width + 8, top + i * 16)))
+        return drawn[0].unionall(drawn[1:])
+
+class FrameClock:
+    """
+    Per-frame time source: reads the wall clock once a frame and turns it
+    into virtual time that can be scaled (slow motion, fast-forward) or
+    paused. Everything updated or drawn in a frame takes its time from here.
+    """
+    def __init__(self, scale=1.0):
+        self.clock = pygame.time.Clock()
+        self.clock.tick()
+        self.scale = scale
+        self.paused = False
+        self.time = 0.0  # Virtual seconds elapsed
+        self.dt = 0.0  # Virtual seconds covered by the last frame
+    
+    def tick(self, fps=FPS):
+        """Wait out the frame cap and return the virtual time it advanced"""
+        elapsed = self.clock.tick(fps) / 1000.0
+        self.dt = 0.0 if self.paused else elapsed * self.scale
+        self.time += self.dt
+        return self.dt
+    
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+heap_frozen = False
+
+def freeze_heap():
+    """
+    Collect garbage, then move every surviving object out of the cyclic
+    collector's reach, once, after start-up and warm-up. Full collections
+    during a game then only scan what it allocates rather than every asset,
+    cache and module, which otherwise stalls a frame for several
+    milliseconds. Frozen objects are never freed, so call this before any
+    Game is created; later calls do nothing.
+    """
+    global heap_frozen
+    if not heap_frozen:
+        heap_frozen = True
+        gc.collect()
+        gc.freeze()
+
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, seed=None, input_source=keyboard_input, profiler=None,
+                 dirty_rects=DIRTY_RECT_RENDERING, horde=False):
+        """
+        Pass screen=None for a headless game that is only ever updated.
+        The seed drives every gameplay random choice and input_source is
+        called once per tick to get that tick's InputFrame. horde=True plays
+        horde mode, with thousands of enemies in an EnemySwarm.
+        """
+        self.profiler = profiler or FrameProfiler()
+        self.clock = FrameClock()  # Replaced by the one run() drives
+        self.dirty_rects = dirty_rects
+        self.previous_rects = None  # Regions drawn last frame; None forces a full redraw
         self.screen = screen
         self.running = True
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.input_source = input_source
+        self.tick = 0
+        self.time = 0.0  # Simulated seconds, advanced by one tick per update
+        self.space_held = False
         self.ship_x = WINDOW_WIDTH // 2
         self.ship_y = WINDOW_HEIGHT - 75  # Was 100
-        self.bullets = []
+        self.prev_ship_x = self.ship_x
+        self.bullets = BulletPool()
+        # Retired enemies and crates are recycled through these pools
+        self.enemy_pools = EntityPools({Enemy: EntityPool(Enemy),
+                                        LargeEnemy: EntityPool(LargeEnemy)})
+        self.crate_pool = EntityPool(AmmoCrate)
         # Add velocity for smooth movement
         self.ship_vel_x = 0.0
         
@@ -471,112 +1809,155 @@ class Game:
         self.current_fire_rate = MAX_FIRE_RATE
         self.can_shoot = True
 
-        self.enemies = []
+        # Released through the pools, not a Game method: a bound method here
+        # would make every game a reference cycle that outlives its run()
+        self.enemies = EntityList(release=self.enemy_pools.release)
+        self.horde = horde
+        self.swarm = None  # Replaces self.enemies in horde mode
+        if horde:
+            self.swarm = EnemySwarm(seed=self.rng.getrandbits(64))
         self.last_enemy_spawn = 0
         self.lives = PLAYER_LIVES
         self.score = 0
         self.powerup_active = False
         self.powerup_end_time = 0
-        self.ammo_crates = []
+        self.ammo_crates = EntityList(release=self.crate_pool.release)
         self.last_crate_spawn = 0
         self.score_penalty_flash = 0  # Timer for penalty flash
         self.penalty_message = ""
-        self.background = create_background()
+        
+        # Per-game stats
+        self.shots_fired = 0
+        self.kills = {"enemy": 0, "large_enemy": 0}
+        self.crates_collected = 0
+        self.penalties = 0
+        self.background = None
+        self.particles = None  # Purely visual, so headless games have none
+        if screen is not None:
+            self.background = get_background(pick_background_seed())
+            prepare_bullet_sprites()
+            prepare_enemy_sprites()
+            self.particles = ParticleSystem(
+                HORDE_PARTICLE_CAPACITY if horde else PARTICLE_CAPACITY, seed=seed)
+        
+        # Collision broad phase, rebuilt once per update
+        self.bullet_grid = SpatialHash()
+        self.entity_grid = SpatialHash()
 
-    def draw_spaceship(self):
-        """Draw a detailed spaceship with multiple components"""
+    def draw_spaceship(self, alpha=1.0):
+        """Draw a detailed spaceship with multiple components and return its bounds"""
+        ship_x = interpolate(self.prev_ship_x, self.ship_x, alpha)
+        drawn = []
         # Main body
         points = [
-            (self.ship_x, self.ship_y - SHIP_HEIGHT),  # Top
-            (self.ship_x - SHIP_WIDTH//2, self.ship_y),  # Bottom left
-            (self.ship_x + SHIP_WIDTH//2, self.ship_y)   # Bottom right
+            (ship_x, self.ship_y - SHIP_HEIGHT),  # Top
+            (ship_x - SHIP_WIDTH//2, self.ship_y),  # Bottom left
+            (ship_x + SHIP_WIDTH//2, self.ship_y)   # Bottom right
         ]
-        pygame.draw.polygon(self.screen, SHIP_BLUE, points)
+        drawn.append(pygame.draw.polygon(self.screen, SHIP_BLUE, points))
         
         # Engine glow
         engine_rect = pygame.Rect(
-            self.ship_x - 11,  # Was 15
+            ship_x - 11,  # Was 15
             self.ship_y - 4,   # Was 5
             22,                # Was 30
             7                  # Was 10
         )
-        pygame.draw.rect(self.screen, NEON_CYAN, engine_rect)
+        drawn.append(pygame.draw.rect(self.screen, NEON_CYAN, engine_rect))
         
         # Cockpit
         cockpit_points = [
-            (self.ship_x, self.ship_y - SHIP_HEIGHT + 15),      # Was 20
-            (self.ship_x - 7, self.ship_y - SHIP_HEIGHT + 30),  # Was 10, 40
-            (self.ship_x + 7, self.ship_y - SHIP_HEIGHT + 30)   # Was 10, 40
+            (ship_x, self.ship_y - SHIP_HEIGHT + 15),      # Was 20
+            (ship_x - 7, self.ship_y - SHIP_HEIGHT + 30),  # Was 10, 40
+            (ship_x + 7, self.ship_y - SHIP_HEIGHT + 30)   # Was 10, 40
         ]
-        pygame.draw.polygon(self.screen, NEON_BLUE, cockpit_points)
+        drawn.append(pygame.draw.polygon(self.screen, NEON_BLUE, cockpit_points))
         
         # Wing details
-        pygame.draw.line(self.screen, SHIP_DETAIL,
-                        (self.ship_x - SHIP_WIDTH//3, self.ship_y - SHIP_HEIGHT//3),
-                        (self.ship_x - SHIP_WIDTH//2, self.ship_y),
-                        3)
-        pygame.draw.line(self.screen, SHIP_DETAIL,
-                        (self.ship_x + SHIP_WIDTH//3, self.ship_y - SHIP_HEIGHT//3),
-                        (self.ship_x + SHIP_WIDTH//2, self.ship_y),
-                        3)
+        drawn.append(pygame.draw.line(self.screen, SHIP_DETAIL,
+                                     (ship_x - SHIP_WIDTH//3, self.ship_y - SHIP_HEIGHT//3),
+                                     (ship_x - SHIP_WIDTH//2, self.ship_y),
+                                     3))
+        drawn.append(pygame.draw.line(self.screen, SHIP_DETAIL,
+                                     (ship_x + SHIP_WIDTH//3, self.ship_y - SHIP_HEIGHT//3),
+                                     (ship_x + SHIP_WIDTH//2, self.ship_y),
+                                     3))
         
         # Armor plates
-        pygame.draw.line(self.screen, SHIP_GRAY,
-                        (self.ship_x - 15, self.ship_y - SHIP_HEIGHT//2),  # Was 20
-                        (self.ship_x + 15, self.ship_y - SHIP_HEIGHT//2),  # Was 20
-                        3)  # Was 4
+        drawn.append(pygame.draw.line(self.screen, SHIP_GRAY,
+                                     (ship_x - 15, self.ship_y - SHIP_HEIGHT//2),  # Was 20
+                                     (ship_x + 15, self.ship_y - SHIP_HEIGHT//2),  # Was 20
+                                     3))  # Was 4
+        return drawn[0].unionall(drawn[1:])
 
     def spawn_enemy(self):
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = self.time
         if current_time - self.last_enemy_spawn >= ENEMY_SPAWN_RATE:
             if len(self.enemies) < MAX_ENEMIES:
                 # Determine number of enemies to spawn
                 spawn_count = 1
-                if random.random() < MULTI_SPAWN_CHANCE:
-                    spawn_count = random.randint(2, 3)
+                if self.rng.random() < MULTI_SPAWN_CHANCE:
+                    spawn_count = self.rng.randint(2, 3)
                 
                 # Spawn enemies
                 for _ in range(spawn_count):
                     if len(self.enemies) < MAX_ENEMIES:
-                        if random.random() < ENEMY_TYPE_THRESHOLD:
-                            self.enemies.append(Enemy())
+                        if self.rng.random() < ENEMY_TYPE_THRESHOLD:
+                            self.enemies.append(self.enemy_pools[Enemy].acquire(self.rng))
                         else:
-                            self.enemies.append(LargeEnemy())
+                            self.enemies.append(self.enemy_pools[LargeEnemy].acquire(self.rng))
                 
                 self.last_enemy_spawn = current_time
 
     def spawn_ammo_crate(self):
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = self.time
         if current_time - self.last_crate_spawn >= AMMO_CRATE_SPAWN_RATE:
-            self.ammo_crates.append(AmmoCrate())
+            self.ammo_crates.append(self.crate_pool.acquire(self.rng))
             self.last_crate_spawn = current_time
 
+    def emit_particles(self, x, y, effect):
+        if self.particles is not None:
+            self.particles.emit(x, y, effect)
+    
     def shoot(self):
         if self.ammo > 0:
             if self.powerup_active:
                 # Spray shot
                 for angle in range(-SPRAY_ANGLE, SPRAY_ANGLE + 1, SPRAY_ANGLE):
-                    bullet = Bullet(self.ship_x, self.ship_y - SHIP_HEIGHT, angle)
-                    self.bullets.append(bullet)
+                    self.bullets.spawn(self.ship_x, self.ship_y - SHIP_HEIGHT, angle)
                 self.ammo -= SPRAY_BULLET_COUNT
+                self.shots_fired += SPRAY_BULLET_COUNT
             else:
                 # Normal shot
-                bullet = Bullet(self.ship_x, self.ship_y - SHIP_HEIGHT)
-                self.bullets.append(bullet)
+                self.bullets.spawn(self.ship_x, self.ship_y - SHIP_HEIGHT)
                 self.ammo -= 1
+                self.shots_fired += 1
 
     def check_powerup(self):
         if self.score > 0 and self.score % 100 == 0:
             self.powerup_active = True
-            self.powerup_end_time = pygame.time.get_ticks() / 1000.0 + POWERUP_DURATION
+            self.powerup_end_time = self.time + POWERUP_DURATION
 
     def update(self):
         """Update game state"""
-        current_time = pygame.time.get_ticks() / 1000.0  # Convert to seconds
-        keys = pygame.key.get_pressed()
+        prof = self.profiler
+        prof.begin("update")
+        prof.mark("input")
+        keys = self.input_source(self)
+        self.tick += 1
+        self.time = self.tick / SIM_RATE
+        current_time = self.time
+        
+        if keys.escape:
+            self.running = False
+        
+        # Pressing fire always gets a shot off straight away
+        if keys.space and not self.space_held:
+            self.shoot()
+        self.space_held = keys.space
         
         # Handle shooting mechanics
-        if keys[pygame.K_SPACE] and self.can_shoot and self.ammo > 0:
+        if keys.space and self.can_shoot and self.ammo > 0:
             if current_time - self.last_shot_time >= self.current_fire_rate:
                 self.shoot()
                 self.last_shot_time = current_time
@@ -584,21 +1965,22 @@ class Game:
                 self.current_fire_rate *= FIRE_RATE_DECAY
                 # Cap the fire rate at the minimum speed
                 self.current_fire_rate = min(self.current_fire_rate, MIN_FIRE_RATE)
-        elif not keys[pygame.K_SPACE]:
+        elif not keys.space:
             # Recover fire rate when not shooting
             self.current_fire_rate *= FIRE_RATE_RECOVERY
             # Cap the recovery at the maximum speed
             self.current_fire_rate = max(self.current_fire_rate, MAX_FIRE_RATE)
         
         # Handle ship movement
+        prof.mark("ship")
         # Apply acceleration based on input
-        if keys[pygame.K_LEFT]:
+        if keys.left:
             self.ship_vel_x -= SHIP_ACCELERATION
-        if keys[pygame.K_RIGHT]:
+        if keys.right:
             self.ship_vel_x += SHIP_ACCELERATION
         
         # Apply friction to slow down when no input
-        if not (keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]):
+        if not (keys.left or keys.right):
             self.ship_vel_x *= SHIP_FRICTION
         
         # Clamp velocity to maximum speed
@@ -609,79 +1991,186 @@ class Game:
             self.ship_vel_x = 0
         
         # Update ship position
+        self.prev_ship_x = self.ship_x
         self.ship_x += self.ship_vel_x
         
         # Keep ship within screen bounds
         self.ship_x = max(SHIP_WIDTH//2, min(WINDOW_WIDTH - SHIP_WIDTH//2, self.ship_x))
         
         # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.move()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+        prof.mark("bullets")
+        self.bullets.move()
 
         # Update powerup status
-        current_time = pygame.time.get_ticks() / 1000.0
         if self.powerup_active and current_time > self.powerup_end_time:
             self.powerup_active = False
         
         # Spawn and update enemies
+        prof.mark("enemies")
+        ship_rect = self.get_ship_rect()
+        if self.swarm is not None:
+            self.update_swarm(ship_rect)
+        else:
+            self.update_enemies(ship_rect)
+        self.bullets.compact()
+        
+        # Update ammo crates
+        prof.mark("crates")
+        self.spawn_ammo_crate()
+        self.entity_grid.clear()
+        for crate in self.ammo_crates:
+            crate.move()
+            rect = crate.get_rect()
+            self.entity_grid.insert(crate, rect.left, rect.top, rect.right, rect.bottom)
+        crate_candidates = self.entity_grid.query_rect(ship_rect)
+        
+        for crate in self.ammo_crates:
+            if crate in crate_candidates and crate.get_rect().colliderect(ship_rect):
+                self.ammo = INITIAL_AMMO
+                self.crates_collected += 1
+                self.emit_particles(crate.x, crate.y, "crate")
+                self.ammo_crates.kill(crate)
+            elif crate.is_off_screen():
+                self.ammo_crates.kill(crate)
+        self.ammo_crates.compact()
+        
+        # Update particles, with a thruster trail from the ship's engine
+        prof.mark("particles")
+        if self.particles is not None:
+            self.particles.emit(self.ship_x, self.ship_y + 3, "thruster")
+            self.particles.update()
+        
+        # Update penalty flash
+        if self.score_penalty_flash > 0:
+            self.score_penalty_flash -= 1
+        prof.end()
+    
+    def update_enemies(self, ship_rect):
+        """Enemy section of update(): spawn, move and collide the enemies"""
+        current_time = self.time
         self.spawn_enemy()
-        for enemy in self.enemies[:]:
-            enemy.move()
-            
+        for enemy in self.enemies:
+            enemy.move(current_time)
+        
+        # Broad phase: bucket bullets and enemies once for this tick
+        self.profiler.mark("collisions")
+        self.bullets.bucket(self.bullet_grid)
+        self.entity_grid.clear()
+        for enemy in self.enemies:
+            # One pixel of slack covers the rounding in collides_with
+            self.entity_grid.insert(enemy,
+                                    enemy.x - ENEMY_WIDTH//2 - 1, enemy.y - ENEMY_HEIGHT//2 - 1,
+                                    enemy.x + ENEMY_WIDTH//2 + 1, enemy.y + ENEMY_HEIGHT//2 + 1)
+        ship_candidates = self.entity_grid.query_rect(ship_rect)
+        reach_x = (ENEMY_WIDTH + BULLET_WIDTH)//2
+        reach_y = (ENEMY_HEIGHT + BULLET_HEIGHT)//2
+        
+        for enemy in self.enemies:
             # Check if enemy passed player
             if enemy.y > WINDOW_HEIGHT:
                 self.score = max(0, self.score - SCORE_PENALTY)
                 self.score_penalty_flash = 60  # Show penalty for 60 frames
                 self.penalty_message = f"-{SCORE_PENALTY} points!"
-                self.enemies.remove(enemy)
+                self.penalties += 1
+                self.enemies.kill(enemy)
                 continue
             
             # Check bullet collisions
-            for bullet in self.bullets[:]:
-                if enemy.collides_with(bullet.get_rect()):
-                    self.bullets.remove(bullet)
-                    if isinstance(enemy, LargeEnemy):
-                        enemy.health -= 1
-                        if enemy.health <= 0:
-                            enemy.exploding = True
-                            self.score += LARGE_ENEMY_SCORE
-                    else:
+            candidates = self.bullet_grid.query(enemy.x - reach_x, enemy.y - reach_y,
+                                                enemy.x + reach_x, enemy.y + reach_y)
+            hit = -1
+            if candidates:
+                hit = self.bullets.find_hit(enemy.x, enemy.y, ENEMY_WIDTH, ENEMY_HEIGHT,
+                                            candidates)
+            if hit >= 0:
+                self.bullets.kill(hit)
+                if isinstance(enemy, LargeEnemy):
+                    enemy.health -= 1
+                    if enemy.health <= 0:
                         enemy.exploding = True
-                        self.score += SCORE_PER_KILL
-                    self.check_powerup()
-                    break
+                        self.score += LARGE_ENEMY_SCORE
+                        self.kills["large_enemy"] += 1
+                        self.emit_particles(enemy.x, enemy.y, "large_kill")
+                else:
+                    enemy.exploding = True
+                    self.score += SCORE_PER_KILL
+                    self.kills["enemy"] += 1
+                    self.emit_particles(enemy.x, enemy.y, "kill")
+                self.check_powerup()
             
             # Check player collision
-            if not enemy.exploding and enemy.collides_with(self.get_ship_rect()):
+            if (enemy in ship_candidates and not enemy.exploding
+                    and enemy.collides_with(ship_rect)):
                 enemy.exploding = True
                 self.lives -= 1
+                self.emit_particles(self.ship_x, self.ship_y - SHIP_HEIGHT // 2, "ship_hit")
                 if self.lives <= 0:
                     self.running = False
             
             # Remove finished explosions and off-screen enemies
             if enemy.is_finished_exploding() or enemy.y > WINDOW_HEIGHT:
-                self.enemies.remove(enemy)
+                self.enemies.kill(enemy)
         
-        # Update ammo crates
-        self.spawn_ammo_crate()
-        for crate in self.ammo_crates[:]:
-            crate.move()
-            if crate.get_rect().colliderect(self.get_ship_rect()):
-                self.ammo = INITIAL_AMMO
-                self.ammo_crates.remove(crate)
-            elif crate.is_off_screen():
-                self.ammo_crates.remove(crate)
+        self.enemies.compact()
+    
+    def update_swarm(self, ship_rect):
+        """Horde mode counterpart of update_enemies(), batched over the swarm"""
+        swarm = self.swarm
+        current_time = self.time
+        # The spawn rate ramps up to HORDE_SPAWN_RATE enemies a second
+        swarm.spawn_debt += (HORDE_SPAWN_RATE * min(1.0, current_time / HORDE_RAMP_TIME)
+                             / SIM_RATE)
+        spawn_count = int(swarm.spawn_debt)
+        swarm.spawn_debt -= spawn_count
+        swarm.spawn(spawn_count, current_time)
+        swarm.move(current_time)
         
-        # Update penalty flash
-        if self.score_penalty_flash > 0:
-            self.score_penalty_flash -= 1
+        self.profiler.mark("collisions")
+        # Enemies that passed the player
+        n = swarm.count
+        passed = swarm.alive[:n] & (swarm.y[:n] > WINDOW_HEIGHT)
+        passed_count = int(np.count_nonzero(passed))
+        if passed_count:
+            self.score = max(0, self.score - SCORE_PENALTY * passed_count)
+            self.score_penalty_flash = 60  # Show penalty for 60 frames
+            self.penalty_message = f"-{SCORE_PENALTY} points!"
+            self.penalties += passed_count
+            swarm.alive[:n] &= ~passed
+        
+        # Bullet hits are scored one by one; their particles are emitted in bulk
+        killed = {"kill": [], "large_kill": []}
+        for index in swarm.hit_by(self.bullets).tolist():
+            swarm.health[index] -= 1
+            if swarm.health[index] <= 0:
+                swarm.exploding[index] = True
+                if swarm.large[index]:
+                    self.score += LARGE_ENEMY_SCORE
+                    self.kills["large_enemy"] += 1
+                    killed["large_kill"].append(index)
+                else:
+                    self.score += SCORE_PER_KILL
+                    self.kills["enemy"] += 1
+                    killed["kill"].append(index)
+            self.check_powerup()
+        for effect, indices in killed.items():
+            if indices:
+                self.emit_particles(swarm.x[indices], swarm.y[indices], effect)
+        
+        # Player collisions
+        for index in swarm.touching(ship_rect).tolist():
+            swarm.exploding[index] = True
+            self.lives -= 1
+            self.emit_particles(self.ship_x, self.ship_y - SHIP_HEIGHT // 2, "ship_hit")
+        if self.lives <= 0:
+            self.running = False
+        
+        swarm.compact()
     
     def draw_hud(self):
+        """Draw the HUD and return the rects it covered"""
         # Draw score
         score_text = f"Score: {self.score}"
-        self.draw_glowing_text(score_text, (20, 20), NEON_GREEN)
+        drawn = [self.draw_glowing_text(score_text, (20, 20), NEON_GREEN)]
         
         # Draw lives
         for i in range(self.lives):
@@ -690,41 +2179,45 @@ class Game:
                 (WINDOW_WIDTH - 30 - (i * 25), 40),
                 (WINDOW_WIDTH - 10 - (i * 25), 40)
             ]
-            pygame.draw.polygon(self.screen, SHIP_BLUE, mini_ship_points)
+            drawn.append(pygame.draw.polygon(self.screen, SHIP_BLUE, mini_ship_points))
         
         # Draw ammo counter
-        self.draw_ammo_counter()
+        drawn.append(self.draw_ammo_counter())
         
         # Draw powerup indicator
         if self.powerup_active:
-            self.draw_glowing_text("POWER UP!", 
-                                 (WINDOW_WIDTH//2, 50), 
-                                 NEON_YELLOW)
+            drawn.append(self.draw_glowing_text("POWER UP!", 
+                                                (WINDOW_WIDTH//2, 50), 
+                                                NEON_YELLOW))
         
         # Draw penalty message
         if self.score_penalty_flash > 0:
             alpha = min(255, self.score_penalty_flash * 4)
-            font = pygame.font.Font(None, 48)
+            font = fonts.get(None, 48)
             penalty_surface = font.render(self.penalty_message, True, NEON_RED)
             penalty_surface.set_alpha(alpha)
             penalty_rect = penalty_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-            self.screen.blit(penalty_surface, penalty_rect)
+            drawn.append(self.screen.blit(penalty_surface, penalty_rect))
+        
+        if self.clock.paused:
+            paused_surface = hud_font().render("PAUSED", True, NEON_CYAN)
+            paused_rect = paused_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//3))
+            drawn.append(self.screen.blit(paused_surface, paused_rect))
+        return drawn
 
     def draw_glowing_text(self, text, position, color):
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render(text, True, color)
+        text_surface = hud_font().render(text, True, color)
         text_rect = text_surface.get_rect(topleft=position)
-        self.screen.blit(text_surface, text_rect)
+        return self.screen.blit(text_surface, text_rect)
 
     def draw_ammo_counter(self):
         """Draw ammo count in bottom right corner with glow effect"""
-        font = pygame.font.Font(None, 36)
         ammo_text = f"Ammo: {self.ammo}"
         
         # Create glowing text effect
-        glow_surfaces, _, main_surface = create_glowing_text(
+        glow_surfaces, _, main_surface = get_glowing_text(
             ammo_text,
-            font,
+            hud_font(),
             NEON_CYAN,
             WHITE,
             glow_size=3
@@ -734,83 +2227,379 @@ class Game:
         pos = (WINDOW_WIDTH - 20, WINDOW_HEIGHT - 20)
         
         # Draw glow layers
+        drawn = []
         for surface in glow_surfaces:
             rect = surface.get_rect(bottomright=pos)
-            self.screen.blit(surface, rect)
+            drawn.append(self.screen.blit(surface, rect))
         
         # Draw main text
         rect = main_surface.get_rect(bottomright=pos)
-        self.screen.blit(main_surface, rect)
+        return self.screen.blit(main_surface, rect).unionall(drawn)
 
-    def draw(self):
-        """Draw game state"""
-        self.screen.blit(self.background, (0, 0))  # Draw background first
-        self.draw_spaceship()
+    def draw(self, alpha=1.0):
+        """
+        Draw game state, with entities placed alpha of the way between
+        the previous and the current simulation tick
+        """
+        prof = self.profiler
+        prof.begin("draw")
+        prof.mark("background")
+        if self.dirty_rects and self.previous_rects is not None:
+            # Only erase what was drawn last frame
+            for rect in self.previous_rects:
+                self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.blit(self.background, (0, 0))  # Draw background first
         
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        prof.mark("entities")
+        drawn = [self.draw_spaceship(alpha)]
+        
+        # Enemies are baked sprites, drawn in a single batch
+        now = self.clock.time
+        if self.swarm is not None:
+            bounds = self.swarm.draw(self.screen, alpha, now, self.ship_y)
+            if bounds is not None:
+                drawn.append(bounds)
+        else:
+            drawn.extend(self.screen.blits([enemy.get_blit(alpha, now)
+                                            for enemy in self.enemies]))
         
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
+        # Draw all bullets in a single batch
+        drawn.extend(self.screen.blits(self.bullets.get_blits(alpha)))
         
         for crate in self.ammo_crates:
-            crate.draw(self.screen)
+            drawn.append(crate.draw(self.screen, alpha))
         
-        self.draw_hud()
-        pygame.display.flip()
+        # Particles are one batched blit
+        drawn.extend(self.particles.draw(self.screen, alpha))
+        
+        prof.mark("hud")
+        drawn.extend(self.draw_hud())
+        if prof.overlay:
+            drawn.append(prof.draw_overlay(self.screen))
+        
+        prof.mark("flip")
+        self.present(drawn)
+        prof.end()
+    
+    def present(self, drawn):
+        """
+        Push this frame to the display, updating only the regions that changed
+        unless they cover too much of the screen
+        """
+        if not self.dirty_rects:
+            pygame.display.flip()
+            return
+        
+        screen_rect = self.screen.get_rect()
+        drawn = [rect.clip(screen_rect) for rect in drawn]
+        previous = self.previous_rects
+        self.previous_rects = drawn
+        if previous is None:
+            pygame.display.flip()
+            return
+        
+        dirty = [rect for rect in previous + drawn if rect.width and rect.height]
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > DIRTY_RECT_MAX_AREA * screen_rect.width * screen_rect.height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
     
     def get_ship_rect(self):
         return pygame.Rect(self.ship_x - SHIP_WIDTH//2, self.ship_y - SHIP_HEIGHT, SHIP_WIDTH, SHIP_HEIGHT)
     
-    def run(self):
-        """Main game loop"""
-        clock = pygame.time.Clock()
+    def stats(self):
+        """Summary record of this game for the stats file"""
+        return {
+            "finished": time.time(),
+            "seed": self.seed,
+            "mode": "horde" if self.horde else "normal",
+            "score": self.score,
+            "duration": self.time,
+            "shots_fired": self.shots_fired,
+            "kills": dict(self.kills),
+            "crates_collected": self.crates_collected,
+            "penalties": self.penalties
+        }
+    
+    def run(self, speed=1.0, max_ticks=None):
+        """
+        Main game loop: fixed-rate simulation ticks, rendering as often as
+        the display allows. speed scales simulated time against wall time
+        and max_ticks ends the game early, e.g. when a replay runs out.
+        """
+        if not (speed > 0 and math.isfinite(speed)):
+            raise ValueError(f"speed must be a positive number, got {speed}")
+        clock = self.clock = FrameClock(scale=speed)
+        tick_length = 1.0 / SIM_RATE
+        accumulator = 0.0
+        max_steps = MAX_CATCHUP_STEPS * max(1, math.ceil(speed))
+        prof = self.profiler
         
         while self.running:
+            if max_ticks is not None and self.tick >= max_ticks:
+                break
+            
+            # Time spent waiting for the frame cap is left out of the profile
+            accumulator += clock.tick(FPS)
+            prof.begin("frame")
+            
+            # Escape and fire are read from the input source in update()
+            prof.mark("events")
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                    elif event.key == pygame.K_SPACE:
-                        self.shoot()
+                    if event.key == PROFILER_TOGGLE_KEY:
+                        prof.toggle()
+                    elif event.key == PROFILER_EXPORT_KEY and prof.count:
+                        prof.export_chrome_trace()
+                    elif event.key == PAUSE_KEY:
+                        clock.toggle_pause()
+            
+            # Run as many ticks as the elapsed time covers
+            prof.mark("simulation")
+            steps = 0
+            while accumulator >= tick_length and self.running:
+                if max_ticks is not None and self.tick >= max_ticks:
+                    break
+                self.update()
+                accumulator -= tick_length
+                steps += 1
+                if steps >= max_steps:
+                    # Too far behind; drop the backlog rather than spiral
+                    accumulator = 0.0
+                    break
             
-            self.update()
-            self.draw()
-            clock.tick(FPS)
+            prof.mark("render")
+            self.draw(accumulator / tick_length)
+            prof.end()
 
-def save_highscore(name, score):
-    scores = []
+def simulate(seed, input_source, max_ticks=HEADLESS_MAX_TICKS, horde=False):
+    """
+    Plays a whole game headless, as fast as the CPU allows, and returns it.
+    The same seed and inputs give the same result as a rendered run.
+    """
+    game = Game(None, seed=seed, input_source=input_source, horde=horde)
+    while game.running and game.tick < max_ticks:
+        game.update()
+    return game
+
+def play_replay(path, speed=1.0, headless=False):
+    """
+    Re-simulate a recorded game, headless or rendered at speed times real
+    time, and return (game, whether its final score matches the recording)
+    """
+    if not (speed > 0 and math.isfinite(speed)):
+        raise ValueError(f"speed must be a positive number, got {speed}")
+    replay = load_replay(path)
+    source = ScriptedInput(replay.frames)
+    if headless:
+        game = simulate(replay.seed, source, max_ticks=len(replay.frames), horde=replay.horde)
+    else:
+        freeze_heap()
+        game = Game(init_display(), seed=replay.seed, input_source=source, horde=replay.horde)
+        game.run(speed=speed, max_ticks=len(replay.frames))
+    return game, game.score == replay.score
+
+# Read once at import, before any thread starts: os.umask can only be read by setting it
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+def write_temp_file(path, data):
+    """
+    Write data to a temporary file next to path and return its name.
+    Swapping it in with os.replace means a crash mid-write never leaves a
+    half-written file at path. The file gets the permissions path already
+    has, or those open() would create it with.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
     try:
-        with open(HIGHSCORE_FILE, 'r') as f:
-            for line in f:
-                n, s = line.strip().split(',')
-                scores.append((n, int(s)))
+        mode = stat.S_IMODE(os.stat(path).st_mode)
     except FileNotFoundError:
-        pass
+        mode = 0o666 & ~UMASK
+    fd, temp_path = tempfile.mkstemp(prefix=".sunblock-", dir=directory)
+    try:
+        # mkstemp always creates the file owner-only
+        os.chmod(temp_path, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return temp_path
+
+class Leaderboard:
+    """
+    In-memory copy of the high score file, best first, reloaded only when
+    the file changes on disk
+    """
+    def __init__(self, path=HIGHSCORE_FILE, keep=HIGHSCORE_KEEP):
+        self.path = path
+        self.keep = keep
+        self.scores = []
+        self.mtime = None  # Modification time of the file when last read
+        self.loaded = False
+        self.loads = 0  # Number of times the file was actually read
+        self.lock = threading.Lock()  # Held while the table or its file changes
+    
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
     
-    scores.append((name, score))
-    scores.sort(key=lambda x: x[1], reverse=True)
-    scores = scores[:10]  # Keep top 10
+    def refresh(self):
+        """Reload the scores if the file changed since it was last read"""
+        with self.lock:
+            self._refresh()
     
-    with open(HIGHSCORE_FILE, 'w') as f:
-        for n, s in scores:
-            f.write(f"{n},{s}\n")
+    def _refresh(self):
+        mtime = self._file_mtime()
+        if self.loaded and mtime == self.mtime:
+            return
+        
+        scores = []
+        if mtime is not None:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    n, _, s = line.strip().rpartition(',')
+                    try:
+                        scores.append((n, int(s)))
+                    except ValueError:
+                        continue  # Skip blank or damaged lines
+        scores.sort(key=lambda x: x[1], reverse=True)
+        self.scores = scores[:self.keep]
+        self.mtime = mtime
+        self.loaded = True
+        self.loads += 1
+    
+    def top(self, k=3):
+        """Return the k best (name, score) pairs"""
+        with self.lock:
+            self._refresh()
+            return self.scores[:k]
+    
+    def add(self, name, score):
+        """Record a score in memory; save() puts it on disk"""
+        with self.lock:
+            self._refresh()
+            self.scores.append((name, score))
+            self.scores.sort(key=lambda x: x[1], reverse=True)
+            del self.scores[self.keep:]
+    
+    def save(self):
+        """Write the current table to disk"""
+        with self.lock:
+            scores = list(self.scores)
+        
+        data = "".join(f"{n},{s}\n" for n, s in scores).encode()
+        temp_path = write_temp_file(self.path, data)
+        with self.lock:
+            os.replace(temp_path, self.path)
+            self.mtime = self._file_mtime()
 
-def get_top_scores():
-    """Get the top 3 high scores from the file"""
-    scores = []
-    try:
-        with open(HIGHSCORE_FILE, 'r') as f:
-            for line in f:
-                n, s = line.strip().split(',')
-                scores.append((n, int(s)))
-    except FileNotFoundError:
-        return []
+class PersistenceWriter:
+    """
+    Background thread that does slow file writes away from the game loop.
+    Jobs wait in a bounded queue and are written in batches: a leaderboard is
+    saved once per batch however many scores arrived, and all stats records
+    in a batch go to disk in a single append.
+    """
+    def __init__(self, stats_path=STATS_FILE, capacity=PERSIST_QUEUE_SIZE):
+        self.stats_path = stats_path
+        self.queue = queue.Queue(capacity)
+        self.thread = None
+        self.batches = 0  # Number of batches written
+    
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="sunblock-persistence",
+                                           daemon=True)
+            self.thread.start()
+    
+    def save_scores(self, board):
+        """Queue the leaderboard to be written, or write it now if not started"""
+        self._submit(("scores", board))
+    
+    def save_stats(self, record):
+        """Queue one per-game stats record to be appended to the stats file"""
+        self._submit(("stats", record))
     
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores[:3]
+    def save_file(self, path, data):
+        """Queue bytes to be written to path, replacing it atomically"""
+        self._submit(("file", (path, data)))
+    
+    def _submit(self, job):
+        if self.thread is None:
+            self._write_batch([job])
+        else:
+            self.queue.put(job)  # Only waits if the disk is far behind
+    
+    def close(self):
+        """Write everything still queued and stop the thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+    
+    def _run(self):
+        while True:
+            jobs = [self.queue.get()]
+            while len(jobs) < PERSIST_BATCH_SIZE:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in jobs
+            try:
+                self._write_batch([job for job in jobs if job is not None])
+            except OSError as e:
+                print(f"Could not save game data: {e}", file=sys.stderr)
+            if stop:
+                return
+    
+    def _write_batch(self, jobs):
+        boards = []
+        records = []
+        files = {}
+        for kind, payload in jobs:
+            if kind == "scores":
+                if payload not in boards:
+                    boards.append(payload)
+            elif kind == "stats":
+                records.append(payload)
+            else:
+                files[payload[0]] = payload[1]  # Only the newest data per path matters
+        
+        for board in boards:
+            board.save()
+        for path, data in files.items():
+            os.replace(write_temp_file(path, data), path)
+        if records:
+            # One write on an O_APPEND descriptor, so the batch lands whole
+            data = "".join(json.dumps(record) + "\n" for record in records).encode()
+            fd = os.open(self.stats_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self.batches += 1
+
+leaderboard = Leaderboard()
+persistence = PersistenceWriter()
+
+def save_highscore(name, score):
+    leaderboard.add(name, score)
+    persistence.save_scores(leaderboard)
+
+def get_top_scores():
+    """Get the top 3 high scores"""
+    return leaderboard.top(3)
 
 def draw_high_scores(screen, center_x, start_y):
     """Draw the top 3 high scores with better spacing"""
@@ -819,9 +2608,9 @@ def draw_high_scores(screen, center_x, start_y):
         return
     
     # Draw header
-    header_surfaces, _, header_main = create_glowing_text(
+    header_surfaces, _, header_main = get_glowing_text(
         "HIGH SCORES",
-        menu_font,
+        menu_font(),
         NEON_BLUE,
         WHITE,
         glow_size=3
@@ -838,9 +2627,9 @@ def draw_high_scores(screen, center_x, start_y):
         score_text = f"#{i+1} {name}: {score}"
         color = NEON_PINK if i == 0 else (NEON_CYAN if i == 1 else NEON_YELLOW)
         
-        score_surfaces, _, score_main = create_glowing_text(
+        score_surfaces, _, score_main = get_glowing_text(
             score_text,
-            menu_font,
+            menu_font(),
             color,
             WHITE,
             glow_size=2
@@ -852,55 +2641,85 @@ def draw_high_scores(screen, center_x, start_y):
             rect = surface.get_rect(center=(center_x, score_y))
             screen.blit(surface, rect)
 
+class IdleThrottle:
+    """
+    Paces the menu screens: sleeps in pygame.event.wait until input arrives
+    or the next animation frame is due, and drops to MENU_IDLE_FPS once
+    there has been no input for MENU_IDLE_TIMEOUT seconds
+    """
+    def __init__(self):
+        self.last_input = time.monotonic()
+    
+    def wait(self, frame_time=None):
+        """
+        Block until there are events or frame_time seconds have passed
+        (None when nothing is animating) and return the events
+        """
+        timeout = 1.0 / MENU_IDLE_FPS
+        idle = time.monotonic() - self.last_input > MENU_IDLE_TIMEOUT
+        if frame_time is not None and not idle:
+            timeout = min(timeout, max(frame_time, 1.0 / FPS))
+        
+        event = pygame.event.wait(max(1, int(timeout * 1000)))
+        if event.type == pygame.NOEVENT:
+            return []
+        self.last_input = time.monotonic()
+        return [event] + pygame.event.get()
+
 # Update the draw_game_over function to show high scores
-def draw_game_over(screen, score):
+def draw_game_over(screen, score, clock=None):
     global game_over_selected
     running = True
-    clock = pygame.time.Clock()
+    clock = clock or FrameClock()
     name = ""
     entering_name = True
+    throttle = IdleThrottle()
+    redraw = True
     
     while entering_name:
-        screen.fill(BLACK)
-        prompt_text = "Enter your name:"
-        name_text = name + "_"
-        
-        # Draw prompt
-        prompt_surfaces, _, prompt_main = create_glowing_text(
-            prompt_text,
-            menu_font,
-            NEON_BLUE,
-            WHITE,
-            glow_size=3
-        )
-        
-        # Draw current name
-        name_surfaces, _, name_main = create_glowing_text(
-            name_text,
-            menu_font,
-            NEON_GREEN,
-            WHITE,
-            glow_size=3
-        )
-        
-        # Position text
-        center_x = WINDOW_WIDTH // 2
-        prompt_y = WINDOW_HEIGHT // 2 - 40
-        name_y = WINDOW_HEIGHT // 2 + 20
-        
-        # Draw all text
-        for surface in prompt_surfaces:
-            rect = surface.get_rect(center=(center_x, prompt_y))
-            screen.blit(surface, rect)
-        
-        for surface in name_surfaces:
-            rect = surface.get_rect(center=(center_x, name_y))
-            screen.blit(surface, rect)
-        
-        pygame.display.flip()
+        if redraw:
+            screen.fill(BLACK)
+            prompt_text = "Enter your name:"
+            name_text = name + "_"
+            
+            # Draw prompt
+            prompt_surfaces, _, prompt_main = get_glowing_text(
+                prompt_text,
+                menu_font(),
+                NEON_BLUE,
+                WHITE,
+                glow_size=3
+            )
+            
+            # Draw current name
+            name_surfaces, _, name_main = get_glowing_text(
+                name_text,
+                menu_font(),
+                NEON_GREEN,
+                WHITE,
+                glow_size=3
+            )
+            
+            # Position text
+            center_x = WINDOW_WIDTH // 2
+            prompt_y = WINDOW_HEIGHT // 2 - 40
+            name_y = WINDOW_HEIGHT // 2 + 20
+            
+            # Draw all text
+            for surface in prompt_surfaces:
+                rect = surface.get_rect(center=(center_x, prompt_y))
+                screen.blit(surface, rect)
+            
+            for surface in name_surfaces:
+                rect = surface.get_rect(center=(center_x, name_y))
+                screen.blit(surface, rect)
+            
+            pygame.display.flip()
+            redraw = False
         
-        # Handle input
-        for event in pygame.event.get():
+        # Handle input, sleeping until some arrives
+        for event in throttle.wait():
+            redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN and name:
                     entering_name = False
@@ -909,74 +2728,77 @@ def draw_game_over(screen, score):
                     name = name[:-1]
                 elif len(name) < 15 and event.unicode.isalnum():
                     name += event.unicode
-        
-        clock.tick(FPS)
+        clock.tick(0)
     
+    redraw = True
     while running:
-        screen.fill(BLACK)
-        
-        # Create game over text
-        game_over_text = "GAME OVER"
-        score_text = f"Final Score: {score}"
-        
-        # Draw main "GAME OVER" text
-        glow_surfaces, shadow_layers, main_surface = create_glowing_text(
-            game_over_text,
-            title_font,
-            NEON_RED,
-            NEON_PINK,
-            glow_size=8,
-            offset_3d=6
-        )
-        
-        # Calculate positions
-        center_x = WINDOW_WIDTH // 2
-        center_y = WINDOW_HEIGHT // 4  # Moved up higher
-        
-        # Draw all layers for main text
-        for shadow in shadow_layers:
-            rect = shadow.get_rect(center=(center_x, center_y))
-            screen.blit(shadow, rect)
-        
-        for surface in glow_surfaces:
-            rect = surface.get_rect(center=(center_x, center_y))
-            screen.blit(surface, rect)
-        
-        rect = main_surface.get_rect(center=(center_x, center_y))
-        screen.blit(main_surface, rect)
-        
-        # Draw score
-        score_surfaces, _, score_main = create_glowing_text(
-            score_text,
-            menu_font,
-            NEON_GREEN,
-            WHITE,
-            glow_size=4
-        )
-        
-        score_y = center_y + 100  # Increased spacing
-        for surface in score_surfaces:
-            rect = surface.get_rect(center=(center_x, score_y))
-            screen.blit(surface, rect)
-        
-        rect = score_main.get_rect(center=(center_x, score_y))
-        screen.blit(score_main, rect)
-        
-        # Draw high scores with more room
-        draw_high_scores(screen, center_x, score_y + 80)
-        
-        # Move menu options down further
-        menu_y = score_y + 250  # Increased spacing
-        menu_rects = []
-        for i, option in enumerate(GAME_OVER_OPTIONS):
-            pos = (center_x, menu_y + i * 70)  # Increased menu option spacing
-            rect = draw_menu_option(option, pos, i == game_over_selected)
-            menu_rects.append(rect)
-        
-        pygame.display.flip()
+        if redraw:
+            screen.fill(BLACK)
+            
+            # Create game over text
+            game_over_text = "GAME OVER"
+            score_text = f"Final Score: {score}"
+            
+            # Draw main "GAME OVER" text
+            glow_surfaces, shadow_layers, main_surface = get_glowing_text(
+                game_over_text,
+                title_font(),
+                NEON_RED,
+                NEON_PINK,
+                glow_size=8,
+                offset_3d=6
+            )
+            
+            # Calculate positions
+            center_x = WINDOW_WIDTH // 2
+            center_y = WINDOW_HEIGHT // 4  # Moved up higher
+            
+            # Draw all layers for main text
+            for shadow in shadow_layers:
+                rect = shadow.get_rect(center=(center_x, center_y))
+                screen.blit(shadow, rect)
+            
+            for surface in glow_surfaces:
+                rect = surface.get_rect(center=(center_x, center_y))
+                screen.blit(surface, rect)
+            
+            rect = main_surface.get_rect(center=(center_x, center_y))
+            screen.blit(main_surface, rect)
+            
+            # Draw score
+            score_surfaces, _, score_main = get_glowing_text(
+                score_text,
+                menu_font(),
+                NEON_GREEN,
+                WHITE,
+                glow_size=4
+            )
+            
+            score_y = center_y + 100  # Increased spacing
+            for surface in score_surfaces:
+                rect = surface.get_rect(center=(center_x, score_y))
+                screen.blit(surface, rect)
+            
+            rect = score_main.get_rect(center=(center_x, score_y))
+            screen.blit(score_main, rect)
+            
+            # Draw high scores with more room
+            draw_high_scores(screen, center_x, score_y + 80)
+            
+            # Move menu options down further
+            menu_y = score_y + 250  # Increased spacing
+            menu_rects = []
+            for i, option in enumerate(GAME_OVER_OPTIONS):
+                pos = (center_x, menu_y + i * 70)  # Increased menu option spacing
+                rect = draw_menu_option(option, pos, i == game_over_selected)
+                menu_rects.append(rect)
+            
+            pygame.display.flip()
+            redraw = False
         
-        # Handle input
-        for event in pygame.event.get():
+        # Handle input, sleeping until some arrives
+        for event in throttle.wait():
+            redraw = True
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -997,23 +2819,163 @@ def draw_game_over(screen, score):
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if menu_rects[game_over_selected].collidepoint(event.pos):
                     return game_over_selected == 0  # Return True for restart, False for quit
+        clock.tick(0)
+
+class AssetWarmer:
+    """
+    Builds game assets ahead of time while the menu is up. Surface work runs
+    on the main thread in time-sliced steps between menu frames; background
+    generation, NumPy's lazy imports and the high score read spend their
+    time in NumPy and file I/O, so they run in a worker thread.
+    """
+    def __init__(self):
+        self.tasks = deque(self._tasks())
+        self.worker_tasks = list(self._worker_tasks())
+        self.worker_jobs = len(self.worker_tasks)
+        self.total = len(self.tasks) + self.worker_jobs
+        self.steps_done = 0
+        self.worker_done = 0
+        self.thread = None
+    
+    def _tasks(self):
+        # Fonts
+        yield title_font, ()
+        yield menu_font, ()
+        yield hud_font, ()
+        yield fonts.get, (None, 48)  # Penalty message
+        yield fonts.get, (None, 20)  # Profiler overlay
         
-        clock.tick(FPS)
+        # Menus, including the game-over options
+        for index in range(TITLE_PULSE_FRAMES):
+            yield get_title_frame, (index,)
+        for option in MENU_OPTIONS + GAME_OVER_OPTIONS:
+            yield get_menu_option, (option, False)
+            yield get_menu_option, (option, True)
+        
+        # Entity sprites
+        for angle in range(-SPRAY_ANGLE, SPRAY_ANGLE + 1, SPRAY_ANGLE):
+            yield get_bullet_sprite, (angle,)
+        for glow_radius in range(5, 11):
+            yield get_enemy_sprite, (False, glow_radius)
+        for health in range(1, LARGE_ENEMY_HEALTH + 1):
+            yield get_enemy_sprite, (True, health)
+        yield get_explosion_atlas, (False,)
+        yield get_explosion_atlas, (True,)
+        yield get_enemy_lod_sprite, (False,)
+        yield get_enemy_lod_sprite, (True,)
+        for color in PARTICLE_COLORS:
+            for level in range(PARTICLE_FADE_STEPS + 1):
+                yield get_particle_sprite, (color, level)
+        
+        # HUD
+        for ammo in range(INITIAL_AMMO, INITIAL_AMMO - WARMUP_AMMO_TEXTS, -1):
+            yield self._glow_text, (f"Ammo: {ammo}", hud_font, NEON_CYAN, WHITE, 3)
+        
+        # Game-over screen
+        yield self._glow_text, ("GAME OVER", title_font, NEON_RED, NEON_PINK, 8, 6)
+        yield self._glow_text, ("Enter your name:", menu_font, NEON_BLUE, WHITE, 3)
+        yield self._glow_text, ("_", menu_font, NEON_GREEN, WHITE, 3)
+        yield self._glow_text, ("HIGH SCORES", menu_font, NEON_BLUE, WHITE, 3)
+    
+    def _worker_tasks(self):
+        # First use of these imports numpy.random and numpy.ma, which takes
+        # longer than a whole main-thread step budget
+        yield np.random.default_rng, ()
+        yield np.unique, (np.zeros(1),)
+        yield leaderboard.refresh, ()
+        for seed in range(BACKGROUND_VARIANTS):
+            yield get_background, (seed,)
+    
+    @staticmethod
+    def _glow_text(text, font, glow_color, main_color, glow_size, offset_3d=4):
+        get_glowing_text(text, font(), glow_color, main_color, glow_size, offset_3d)
+    
+    def start(self):
+        """Start the worker thread; main-thread work happens in step()"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._work, name="sunblock-warmup",
+                                           daemon=True)
+            self.thread.start()
+    
+    def _work(self):
+        for task, args in self.worker_tasks:
+            try:
+                task(*args)
+            except Exception as e:
+                # Warm-up is only an optimization; the game retries on first use
+                print(f"Warm-up step {task.__name__} failed: {e}", file=sys.stderr)
+            # Failed steps count as done, or the menu would wait for them forever
+            self.worker_done += 1
+    
+    def step(self, budget=WARMUP_BUDGET):
+        """Run main-thread tasks until budget seconds have been spent"""
+        deadline = time.perf_counter() + budget
+        while self.tasks and time.perf_counter() < deadline:
+            task, args = self.tasks.popleft()
+            task(*args)
+            self.steps_done += 1
+    
+    @property
+    def progress(self):
+        """Fraction of the warm-up that is done, from 0 to 1"""
+        return (self.steps_done + self.worker_done) / self.total
+    
+    @property
+    def ready(self):
+        return not self.tasks and self.worker_done == self.worker_jobs
+
+def draw_warmup_progress(progress):
+    """Draw a thin loading bar along the bottom of the menu"""
+    bar = pygame.Rect(0, 0, 200, 6)
+    bar.midbottom = (WINDOW_WIDTH // 2, WINDOW_HEIGHT - 30)
+    pygame.draw.rect(screen, NEON_BLUE, bar, 1)
+    filled = bar.inflate(-2, -2)
+    filled.width = int(filled.width * progress)
+    pygame.draw.rect(screen, NEON_CYAN, filled)
 
 # Update the main function's game state handling
-def main():
-    """Main program"""
+def run_menus(clock, record_path=REPLAY_FILE, warmer=None):
+    """
+    Menu and game state machine, until the player quits. Every game is
+    recorded to record_path so it can be replayed. While the menu is up,
+    warmer pre-builds game assets.
+    """
     global selected_option
-    clock = pygame.time.Clock()
     running = True
     game_state = "MENU"
+    throttle = IdleThrottle()
+    redraw = True
+    shown_frame = None
+    shown_progress = None
+    horde = False
     
     while running:
         if game_state == "MENU":
-            screen.fill(BLACK)
-            menu_rects = draw_menu()
+            # Redraw only for input or when the title pulse or loading bar moves
+            frame = title_frame_index(clock.time)
+            warming = warmer is not None and not warmer.ready
+            progress = round(warmer.progress, 2) if warming else None
+            if redraw or frame != shown_frame or progress != shown_progress:
+                screen.fill(BLACK)
+                menu_rects = draw_menu(clock.time)
+                if warming:
+                    draw_warmup_progress(warmer.progress)
+                pygame.display.flip()
+                shown_frame = frame
+                shown_progress = progress
+                redraw = False
             
-            for event in pygame.event.get():
+            if warming:
+                # Keep slicing warm-up work in between menu frames
+                events = throttle.wait(0)
+                warmer.step()
+                if warmer.ready:
+                    freeze_heap()
+            else:
+                events = throttle.wait(TITLE_FRAME_TIME / clock.scale)
+            clock.tick(0)
+            for event in events:
+                redraw = True
                 if event.type == pygame.QUIT:
                     running = False
                 
@@ -1025,7 +2987,11 @@ def main():
                     elif event.key == pygame.K_RETURN:
                         if selected_option == 0:  # Start Game
                             game_state = "GAME"
-                        elif selected_option == 1:  # Quit
+                            horde = False
+                        elif selected_option == 1:  # Horde Mode
+                            game_state = "GAME"
+                            horde = True
+                        elif selected_option == 2:  # Quit
                             running = False
                 
                 if event.type == pygame.MOUSEMOTION:
@@ -1037,19 +3003,67 @@ def main():
                     if menu_rects[selected_option].collidepoint(event.pos):
                         if selected_option == 0:  # Start Game
                             game_state = "GAME"
-                        elif selected_option == 1:  # Quit
+                            horde = False
+                        elif selected_option == 1:  # Horde Mode
+                            game_state = "GAME"
+                            horde = True
+                        elif selected_option == 2:  # Quit
                             running = False
         
         elif game_state == "GAME":
-            game = Game(screen)
+            freeze_heap()  # Unless warm-up already did
+            seed = random.randrange(2 ** 32)
+            recorder = InputRecorder()
+            game = Game(screen, seed=seed, input_source=recorder, horde=horde)
             game.run()
-            if draw_game_over(screen, game.score):
+            persistence.save_stats(game.stats())
+            persistence.save_file(record_path, encode_replay(
+                Replay(seed, recorder.frames, game.score, horde)))
+            if draw_game_over(screen, game.score, clock):
                 game_state = "GAME"  # Restart game
             else:
                 game_state = "MENU"  # Return to main menu
-        
-        pygame.display.flip()
-        clock.tick(FPS)
+                throttle = IdleThrottle()
+                redraw = True
+
+def positive_float(text):
+    """argparse type for multipliers that must be finite and greater than zero"""
+    value = float(text)
+    if not (value > 0 and math.isfinite(value)):
+        raise argparse.ArgumentTypeError(f"must be a positive number: {text}")
+    return value
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded game")
+    parser.add_argument("--speed", type=positive_float, default=1.0,
+                        help="speed multiplier for rendered replays")
+    parser.add_argument("--headless", action="store_true",
+                        help="re-simulate the replay without a window, as fast as possible")
+    parser.add_argument("--record", metavar="FILE", default=REPLAY_FILE,
+                        help="file each game is recorded to")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main program"""
+    args = parse_args(argv)
+    if args.replay:
+        game, matches = play_replay(args.replay, speed=args.speed, headless=args.headless)
+        print(f"Replayed {game.tick} ticks, final score {game.score}: "
+              + ("matches the recording" if matches else "DOES NOT match the recording"))
+        pygame.quit()
+        sys.exit(0 if matches else 1)
+    
+    init_display()
+    persistence.start()
+    clock = FrameClock()
+    warmer = AssetWarmer()
+    warmer.start()
+    try:
+        run_menus(clock, args.record, warmer)
+    finally:
+        # Make sure queued scores and stats reach the disk
+        persistence.close()
     
     pygame.quit()
     sys.exit()
@@ -0,0 +1,294 @@
+"""
+Frame-time benchmarks for Sunblock.
+
+Builds synthetic scenes with N enemies, M bullets and K crates, then times
+Game.update and Game.draw separately on an offscreen surface under the SDL
+dummy video driver. Results (p50/p99 per-frame cost of each phase and of
+the whole frame, and per-frame allocations) are written to JSON so runs
+can be compared between commits.
+Horde-mode scenes time the same phases with thousands of enemies in an
+EnemySwarm. Start-up latency, from interpreter start through the import to
+the first menu frame on screen, is measured in fresh subprocesses.
+
+    python sunblock_bench.py -o before.json
+    python sunblock_bench.py -o after.json --compare before.json
+"""
+import os
+
+# Benchmarks never open a real window or play sound
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+import sunblock
+
+# Benchmark defaults: (enemies, bullets, crates) per scene
+DEFAULT_SCENES = [
+    (8, 20, 1),
+    (50, 200, 5),
+    (200, 1000, 10),
+    (500, 2000, 20),
+    (1000, 5000, 50)
+]
+# Horde mode scenes, same layout
+DEFAULT_HORDE_SCENES = [
+    (500, 200, 5),
+    (2000, 500, 10),
+    (3000, 1000, 10)
+]
+DEFAULT_FRAMES = 120
+WARMUP_FRAMES = 10
+BENCH_SEED = 1234
+STARTUP_RUNS = 5
+
+# Run in a fresh interpreter; prints the start-up milestones as JSON
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import sunblock
+imported = time.perf_counter()
+screen = sunblock.init_display()
+displayed = time.perf_counter()
+screen.fill(sunblock.BLACK)
+sunblock.draw_menu()
+sunblock.pygame.display.flip()
+drawn = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1e3,
+                  "display_ms": (displayed - imported) * 1e3,
+                  "first_frame_ms": (drawn - displayed) * 1e3,
+                  "import_to_frame_ms": (drawn - start) * 1e3}))
+"""
+
+def build_scene(screen, enemies, bullets, crates, seed=BENCH_SEED, horde=False):
+    """Create a game that never ends and top it up to the requested counts"""
+    sunblock.freeze_heap()  # Once, before the first scene, as the game does after warm-up
+    game = sunblock.Game(screen, seed=seed, input_source=lambda game: sunblock.NO_INPUT,
+                         horde=horde)
+    scene = {"enemies": enemies, "bullets": bullets, "crates": crates,
+             "rng": random.Random(seed)}
+    top_up(game, scene)
+    return game, scene
+
+def top_up(game, scene):
+    """Replace entities that died or left the screen since the last frame"""
+    rng = scene["rng"]
+    # Ship collisions must not end the benchmark
+    game.lives = sunblock.PLAYER_LIVES
+    game.running = True
+    if game.swarm is not None:
+        swarm = game.swarm
+        start = swarm.count
+        swarm.spawn(scene["enemies"] - start, game.time)
+        for i in range(start, swarm.count):
+            swarm.y[i] = swarm.prev_y[i] = rng.uniform(0, sunblock.WINDOW_HEIGHT * 0.8)
+    while len(game.enemies) < scene["enemies"]:
+        kind = sunblock.Enemy if rng.random() < sunblock.ENEMY_TYPE_THRESHOLD else sunblock.LargeEnemy
+        enemy = game.enemy_pools[kind].acquire(game.rng)
+        enemy.y = enemy.prev_y = rng.uniform(0, sunblock.WINDOW_HEIGHT * 0.8)
+        game.enemies.append(enemy)
+    while len(game.bullets) < scene["bullets"]:
+        angle = rng.choice([-sunblock.SPRAY_ANGLE, 0, sunblock.SPRAY_ANGLE])
+        game.bullets.spawn(rng.uniform(0, sunblock.WINDOW_WIDTH),
+                           rng.uniform(0, sunblock.WINDOW_HEIGHT), angle)
+    while len(game.ammo_crates) < scene["crates"]:
+        crate = game.crate_pool.acquire(game.rng)
+        crate.y = crate.prev_y = rng.uniform(0, sunblock.WINDOW_HEIGHT * 0.8)
+        game.ammo_crates.append(crate)
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+def summarize(samples, scale, unit):
+    samples = sorted(samples)
+    return {
+        f"p50_{unit}": percentile(samples, 0.5) * scale,
+        f"p99_{unit}": percentile(samples, 0.99) * scale,
+        f"mean_{unit}": sum(samples) / len(samples) * scale
+    }
+
+def time_frames(game, scene, frames):
+    """Per-frame wall time of update and draw, in nanoseconds"""
+    update_times = []
+    draw_times = []
+    for _ in range(frames):
+        top_up(game, scene)
+        start = time.perf_counter_ns()
+        game.update()
+        middle = time.perf_counter_ns()
+        game.draw()
+        end = time.perf_counter_ns()
+        update_times.append(middle - start)
+        draw_times.append(end - middle)
+    return update_times, draw_times
+
+def measure_allocations(game, scene, frames):
+    """Peak bytes allocated by update and draw in each frame"""
+    update_peaks = []
+    draw_peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            top_up(game, scene)
+            for step, peaks in ((game.update, update_peaks), (game.draw, draw_peaks)):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                step()
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return update_peaks, draw_peaks
+
+def run_scene(screen, enemies, bullets, crates, frames, allocations=True, horde=False):
+    game, scene = build_scene(screen, enemies, bullets, crates, horde=horde)
+    time_frames(game, scene, WARMUP_FRAMES)
+    update_times, draw_times = time_frames(game, scene, frames)
+    result = {
+        "scene": ("horde " if horde else "") + f"{enemies}e/{bullets}b/{crates}c",
+        "horde": horde,
+        "enemies": enemies,
+        "bullets": bullets,
+        "crates": crates,
+        "frames": frames,
+        "update": summarize(update_times, 1e-3, "us"),
+        "draw": summarize(draw_times, 1e-3, "us"),
+        "frame": summarize([u + d for u, d in zip(update_times, draw_times)], 1e-3, "us")
+    }
+    if allocations:
+        update_peaks, draw_peaks = measure_allocations(game, scene, max(10, frames // 4))
+        result["update"].update(summarize(update_peaks, 1 / 1024, "alloc_kb"))
+        result["draw"].update(summarize(draw_peaks, 1 / 1024, "alloc_kb"))
+    return result
+
+def measure_startup(runs):
+    """
+    Time import-to-first-menu-frame in fresh interpreters; every run is
+    reported.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample["process_ms"] = (time.perf_counter() - start) * 1e3
+        samples.append(sample)
+    
+    result = {"runs": samples}
+    for key in samples[0]:
+        result[f"p50_{key}"] = percentile(sorted(sample[key] for sample in samples), 0.5)
+    print(f"{'startup':>20}  import p50 {result['p50_import_ms']:7.1f}ms"
+          f"  import-to-frame p50 {result['p50_import_to_frame_ms']:7.1f}ms"
+          f"  process p50 {result['p50_process_ms']:7.1f}ms")
+    return result
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(scenes, frames, allocations=True, startup_runs=STARTUP_RUNS,
+                   horde_scenes=DEFAULT_HORDE_SCENES):
+    startup = measure_startup(startup_runs) if startup_runs else None
+    screen = sunblock.init_display()
+    offscreen = pygame.Surface(screen.get_size()).convert()
+    results = []
+    runs = [(scene, False) for scene in scenes] + [(scene, True) for scene in horde_scenes]
+    for (enemies, bullets, crates), horde in runs:
+        result = run_scene(offscreen, enemies, bullets, crates, frames, allocations, horde)
+        results.append(result)
+        print(f"{result['scene']:>20}  update p50 {result['update']['p50_us']:9.1f}us"
+              f"  p99 {result['update']['p99_us']:9.1f}us"
+              f"  draw p50 {result['draw']['p50_us']:9.1f}us"
+              f"  p99 {result['draw']['p99_us']:9.1f}us"
+              f"  frame p99 {result['frame']['p99_us']:9.1f}us")
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "frames": frames
+        },
+        "startup": startup,
+        "results": results
+    }
+
+def compare(report, baseline):
+    """Print the change in p50/p99 for every scene present in both reports"""
+    previous = {result["scene"]: result for result in baseline["results"]}
+    print(f"\nCompared with {baseline['meta'].get('revision') or 'baseline'}:")
+    for result in report["results"]:
+        old = previous.get(result["scene"])
+        if old is None:
+            continue
+        changes = []
+        for phase in ("update", "draw", "frame"):
+            if phase not in old:
+                continue
+            for stat in ("p50_us", "p99_us"):
+                before = old[phase][stat]
+                after = result[phase][stat]
+                ratio = after / before if before else float("inf")
+                changes.append(f"{phase} {stat[:3]} x{ratio:5.2f}")
+        print(f"{result['scene']:>20}  " + "  ".join(changes))
+    
+    if report.get("startup") and baseline.get("startup"):
+        changes = []
+        for stat in ("p50_import_ms", "p50_import_to_frame_ms"):
+            before = baseline["startup"][stat]
+            after = report["startup"][stat]
+            changes.append(f"{stat[4:-3]} x{after / before if before else float('inf'):5.2f}")
+        print(f"{'startup':>20}  " + "  ".join(changes))
+
+def parse_scene(text):
+    enemies, bullets, crates = (int(value) for value in text.split(","))
+    return enemies, bullets, crates
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Sunblock frame times")
+    parser.add_argument("--scene", dest="scenes", action="append", type=parse_scene,
+                        metavar="N,M,K", help="enemies,bullets,crates (repeatable)")
+    parser.add_argument("--horde-scene", dest="horde_scenes", action="append",
+                        type=parse_scene, metavar="N,M,K",
+                        help="horde mode enemies,bullets,crates (repeatable)")
+    parser.add_argument("--no-horde", action="store_true", help="skip the horde mode scenes")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help="timed frames per scene")
+    parser.add_argument("--no-alloc", action="store_true",
+                        help="skip the allocation measurement pass")
+    parser.add_argument("--startup-runs", type=int, default=STARTUP_RUNS,
+                        help="fresh processes timed for start-up latency (0 to skip)")
+    parser.add_argument("-o", "--output", default="bench.json", help="JSON results file")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare with")
+    args = parser.parse_args()
+
+    horde_scenes = [] if args.no_horde else args.horde_scenes or DEFAULT_HORDE_SCENES
+    report = run_benchmarks(args.scenes or DEFAULT_SCENES, args.frames,
+                            allocations=not args.no_alloc, startup_runs=args.startup_runs,
+                            horde_scenes=horde_scenes)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Batch parameter sweeps for Sunblock.
+
+Plays headless games for every combination of constant overrides, spread
+over all CPU cores, and streams one row of aggregate stats per combination
+to a CSV (or Parquet) file.
+
+    python sunblock_sweep.py --set ENEMY_SPAWN_RATE=1.5,2.0,2.5 \\
+        --set MULTI_SPAWN_CHANCE=0.2,0.3 --episodes 200 --policy bot -o sweep.csv
+"""
+import os
+
+# Workers never open a window, play sound or print the pygame banner
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import argparse
+import ast
+import csv
+import itertools
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import sunblock
+
+# Sweep defaults
+DEFAULT_EPISODES = 100
+EPISODES_PER_TASK = 10  # Episodes each worker plays before reporting back
+BOT_DEADZONE = 8  # Bot stops steering when this close to its target (pixels)
+BOT_AIM_WIDTH = 30  # Bot fires when the target is within this many pixels
+BOT_LOW_AMMO = 50  # Bot goes for crates below this much ammo
+BOT_AIM_JITTER = 6  # Bot misjudges its target's position by up to this many pixels
+SCRIPT_MAX_RUN = 40  # Longest run of identical inputs in a scripted policy
+
+FIELDS = ["episodes", "score_mean", "score_stdev", "score_min", "score_max",
+          "survival_mean", "starved_mean", "starved_fraction", "timeouts"]
+
+class BotPolicy:
+    """
+    Simple tracking bot: chases crates when low on ammo, otherwise lines up
+    under the lowest enemy and fires. The seed drives its aim jitter.
+    """
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def __call__(self, game):
+        target = None
+        if game.ammo < BOT_LOW_AMMO and game.ammo_crates:
+            target = max(game.ammo_crates, key=lambda crate: crate.y)
+        else:
+            enemies = [enemy for enemy in game.enemies if not enemy.exploding]
+            if enemies:
+                target = max(enemies, key=lambda enemy: enemy.y)
+        if target is None:
+            return sunblock.NO_INPUT
+
+        dx = target.x + self.rng.uniform(-BOT_AIM_JITTER, BOT_AIM_JITTER) - game.ship_x
+        fire = abs(dx) < BOT_AIM_WIDTH
+        return sunblock.InputFrame(dx < -BOT_DEADZONE, dx > BOT_DEADZONE, fire, False)
+
+class ScriptPolicy:
+    """
+    Seeded script of random left/right/fire runs, looped for the whole game
+    """
+    def __init__(self, seed):
+        rng = random.Random(seed)
+        frames = []
+        while len(frames) < sunblock.SIM_RATE * 60:
+            frame = sunblock.InputFrame(rng.random() < 0.35, rng.random() < 0.35,
+                                        rng.random() < 0.6, False)
+            frames.extend([frame] * rng.randint(1, SCRIPT_MAX_RUN))
+        self.script = sunblock.ScriptedInput(frames, loop=True)
+
+    def __call__(self, game):
+        return self.script(game)
+
+POLICIES = {"bot": BotPolicy, "script": ScriptPolicy}
+
+def play_episode(seed, policy_name, max_ticks):
+    """Play one headless game and return its per-episode stats"""
+    game = sunblock.Game(None, seed=seed, input_source=POLICIES[policy_name](seed))
+    starved = 0
+    while game.running and game.tick < max_ticks:
+        game.update()
+        if game.ammo <= 0:
+            starved += 1
+    return {
+        "score": game.score,
+        "survival": game.tick / sunblock.SIM_RATE,
+        "starved": starved / sunblock.SIM_RATE,
+        "timeout": game.running
+    }
+
+def _init_worker():
+    # Keep worker output off the terminal entirely
+    sys.stdout = open(os.devnull, "w")
+
+def run_task(overrides, seeds, policy_name, max_ticks):
+    """Worker entry point: play a batch of episodes under the given overrides"""
+    originals = {name: getattr(sunblock, name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            setattr(sunblock, name, value)
+        return [play_episode(seed, policy_name, max_ticks) for seed in seeds]
+    finally:
+        for name, value in originals.items():
+            setattr(sunblock, name, value)
+
+def summarize(overrides, episodes):
+    """Aggregate per-episode stats into one output row"""
+    scores = [episode["score"] for episode in episodes]
+    survival = sum(episode["survival"] for episode in episodes)
+    starved = sum(episode["starved"] for episode in episodes)
+    row = dict(overrides)
+    row.update({
+        "episodes": len(episodes),
+        "score_mean": statistics.fmean(scores),
+        "score_stdev": statistics.stdev(scores) if len(scores) > 1 else 0.0,
+        "score_min": min(scores),
+        "score_max": max(scores),
+        "survival_mean": survival / len(episodes),
+        "starved_mean": starved / len(episodes),
+        "starved_fraction": starved / survival if survival else 0.0,
+        "timeouts": sum(episode["timeout"] for episode in episodes)
+    })
+    return row
+
+class CsvSink:
+    def __init__(self, path, columns):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    def __init__(self, path, columns):
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.columns = columns
+        self.writer = None
+        self.path = path
+
+    def write(self, row):
+        table = self.pyarrow.Table.from_pylist([{name: row[name] for name in self.columns}])
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def open_sink(path, columns):
+    if path.endswith(".parquet"):
+        try:
+            return ParquetSink(path, columns)
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow; use a .csv path instead")
+    return CsvSink(path, columns)
+
+def parse_override(text):
+    """Parse NAME=v1,v2,... into (NAME, [values])"""
+    name, _, values = text.partition("=")
+    name = name.strip()
+    if not name.isupper() or not hasattr(sunblock, name):
+        raise argparse.ArgumentTypeError(f"unknown game constant: {name}")
+    try:
+        parsed = [ast.literal_eval(value.strip()) for value in values.split(",")]
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"bad values for {name}: {values}")
+    return name, parsed
+
+def build_grid(overrides):
+    """Cartesian product of every override's values, as a list of dicts"""
+    names = [name for name, _ in overrides]
+    return [dict(zip(names, combo))
+            for combo in itertools.product(*(values for _, values in overrides))]
+
+def sweep(grid, episodes, policy_name, output, workers=None, base_seed=0,
+          max_ticks=sunblock.HEADLESS_MAX_TICKS):
+    """Fan the grid out over a process pool and stream one row per grid point"""
+    columns = list(grid[0]) + FIELDS if grid else FIELDS
+    sink = open_sink(output, columns)
+    results = {index: [] for index in range(len(grid))}
+    pending = {}
+    seeds = range(base_seed, base_seed + episodes)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_worker) as pool:
+            futures = {}
+            for index, overrides in enumerate(grid):
+                batches = [seeds[i:i + EPISODES_PER_TASK]
+                           for i in range(0, episodes, EPISODES_PER_TASK)]
+                pending[index] = len(batches)
+                for batch in batches:
+                    future = pool.submit(run_task, overrides, list(batch), policy_name, max_ticks)
+                    futures[future] = index
+
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index].extend(future.result())
+                pending[index] -= 1
+                if pending[index] == 0:
+                    sink.write(summarize(grid[index], results.pop(index)))
+    finally:
+        sink.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Sunblock constants over headless games")
+    parser.add_argument("--set", dest="overrides", action="append", default=[],
+                        type=parse_override, metavar="NAME=V1,V2",
+                        help="game constant and the values to try (repeatable)")
+    parser.add_argument("--episodes", type=int, default=DEFAULT_EPISODES,
+                        help="games per grid point")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="bot")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--max-ticks", type=int, default=sunblock.HEADLESS_MAX_TICKS,
+                        help="cut games off after this many simulation ticks")
+    parser.add_argument("-o", "--output", default="sweep.csv",
+                        help="output file (.csv or .parquet)")
+    args = parser.parse_args()
+
+    grid = build_grid(args.overrides)
+    sweep(grid, args.episodes, args.policy, args.output,
+          workers=args.workers, base_seed=args.seed, max_ticks=args.max_ticks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Tests for Sunblock's collision broad phase.
+
+Every grid-based check in Game.update must reach the same decision as
+testing every pair directly, on seeded random scenes.
+
+    python -m pytest -q test_sunblock.py
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import random
+
+import pygame
+import pytest
+
+import sunblock
+
+SCENE_SEEDS = range(20)
+QUERIES_PER_SCENE = 500
+
+def random_enemy(rng):
+    kind = sunblock.Enemy if rng.random() < sunblock.ENEMY_TYPE_THRESHOLD else sunblock.LargeEnemy
+    enemy = kind(rng)
+    enemy.x = rng.uniform(-20, sunblock.WINDOW_WIDTH + 20)
+    enemy.y = rng.uniform(-40, sunblock.WINDOW_HEIGHT + 20)
+    return enemy
+
+def random_ship_rect(rng):
+    x = rng.uniform(0, sunblock.WINDOW_WIDTH)
+    y = rng.uniform(0, sunblock.WINDOW_HEIGHT + sunblock.SHIP_HEIGHT)
+    return pygame.Rect(x - sunblock.SHIP_WIDTH//2, y - sunblock.SHIP_HEIGHT,
+                       sunblock.SHIP_WIDTH, sunblock.SHIP_HEIGHT)
+
+def bullet_rect(bullets, index):
+    return pygame.Rect(bullets.x[index] - sunblock.BULLET_WIDTH//2,
+                       bullets.y[index] - sunblock.BULLET_HEIGHT//2,
+                       sunblock.BULLET_WIDTH, sunblock.BULLET_HEIGHT)
+
+@pytest.mark.parametrize("seed", SCENE_SEEDS)
+def test_bullet_grid_matches_brute_force(seed):
+    rng = random.Random(seed)
+    bullets = sunblock.BulletPool()
+    for _ in range(rng.randint(1, 300)):
+        bullets.spawn(rng.uniform(-10, sunblock.WINDOW_WIDTH + 10),
+                      rng.uniform(-20, sunblock.WINDOW_HEIGHT + 20),
+                      rng.choice([-sunblock.SPRAY_ANGLE, 0, sunblock.SPRAY_ANGLE]))
+    # Some bullets were already spent on earlier enemies this tick
+    for index in range(len(bullets)):
+        if rng.random() < 0.1:
+            bullets.kill(index)
+    grid = sunblock.SpatialHash()
+    bullets.bucket(grid)
+    reach_x = (sunblock.ENEMY_WIDTH + sunblock.BULLET_WIDTH)//2
+    reach_y = (sunblock.ENEMY_HEIGHT + sunblock.BULLET_HEIGHT)//2
+
+    for _ in range(QUERIES_PER_SCENE):
+        enemy = random_enemy(rng)
+        expected = next((index for index in range(len(bullets))
+                         if bullets.alive[index]
+                         and enemy.collides_with(bullet_rect(bullets, index))), -1)
+        candidates = grid.query(enemy.x - reach_x, enemy.y - reach_y,
+                                enemy.x + reach_x, enemy.y + reach_y)
+        hit = -1
+        if candidates:
+            hit = bullets.find_hit(enemy.x, enemy.y, sunblock.ENEMY_WIDTH,
+                                   sunblock.ENEMY_HEIGHT, candidates)
+        assert hit == expected
+
+@pytest.mark.parametrize("seed", SCENE_SEEDS)
+def test_enemy_grid_matches_brute_force(seed):
+    rng = random.Random(seed)
+    enemies = [random_enemy(rng) for _ in range(rng.randint(1, 200))]
+    grid = sunblock.SpatialHash()
+    for enemy in enemies:
+        # Same slack Game.update_enemies inserts with
+        grid.insert(enemy,
+                    enemy.x - sunblock.ENEMY_WIDTH//2 - 1, enemy.y - sunblock.ENEMY_HEIGHT//2 - 1,
+                    enemy.x + sunblock.ENEMY_WIDTH//2 + 1, enemy.y + sunblock.ENEMY_HEIGHT//2 + 1)
+
+    for _ in range(QUERIES_PER_SCENE):
+        ship_rect = random_ship_rect(rng)
+        candidates = grid.query_rect(ship_rect)
+        for enemy in enemies:
+            expected = enemy.collides_with(ship_rect)
+            assert (enemy in candidates and enemy.collides_with(ship_rect)) == expected
+
+@pytest.mark.parametrize("seed", SCENE_SEEDS)
+def test_crate_grid_matches_brute_force(seed):
+    rng = random.Random(seed)
+    crates = []
+    for _ in range(rng.randint(1, 50)):
+        crate = sunblock.AmmoCrate(rng)
+        crate.y = rng.uniform(-40, sunblock.WINDOW_HEIGHT + 20)
+        crates.append(crate)
+    grid = sunblock.SpatialHash()
+    for crate in crates:
+        rect = crate.get_rect()
+        grid.insert(crate, rect.left, rect.top, rect.right, rect.bottom)
+
+    for _ in range(QUERIES_PER_SCENE):
+        ship_rect = random_ship_rect(rng)
+        candidates = grid.query_rect(ship_rect)
+        for crate in crates:
+            expected = crate.get_rect().colliderect(ship_rect)
+            assert (crate in candidates and crate.get_rect().colliderect(ship_rect)) == expected